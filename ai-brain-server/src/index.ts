@@ -2,6 +2,7 @@ import express from 'express';
 import cors from 'cors';
 import dotenv from 'dotenv';
 import { json } from 'body-parser';
+import axios from 'axios';
 
 dotenv.config();
 
@@ -10,6 +11,14 @@ import { logger } from './utils/logger';
 const app = express();
 const port = process.env.PORT || 3000;
 
+// Multi-worker mode (started by `python3 setup.py --serve`):
+// BRAIN_LISTEN_FD      - listening socket shared by all workers
+// BRAIN_WORKER_PORT    - per-worker localhost port for health checks
+// BRAIN_MEMORY_WRITER_URL - set on reader workers; memory writes go to the single writer
+const listenFd = process.env.BRAIN_LISTEN_FD;
+const workerPort = process.env.BRAIN_WORKER_PORT;
+const memoryWriterUrl = process.env.BRAIN_MEMORY_WRITER_URL;
+
 app.use(cors());
 app.use(express.json());
 
@@ -30,31 +39,46 @@ app.post('/logs', (req, res) => {
     res.json({ success: true });
 });
 
-// Health Check
-app.get('/health', (req, res) => {
-    res.json({
-        status: 'online',
-        service: 'AI Brain (Exocortex)',
-        version: '1.0.0',
-        memory: 'initialized'
-    });
-});
-
 // Brain Components
 import { BrocaService } from './services/broca';
 import { HippocampusService } from './services/hippocampus';
 
 const broca = new BrocaService();
-const hippocampus = new HippocampusService();
+const hippocampus = new HippocampusService({ reloadOnChange: !!memoryWriterUrl });
 
 // Initialize Memory on Start
-hippocampus.init().catch(err => console.error('Memory Init Failed:', err));
+let memoryStatus: 'loading' | 'initialized' | 'failed' = 'loading';
+hippocampus.init()
+    .then(() => { memoryStatus = 'initialized'; })
+    .catch(err => {
+        memoryStatus = 'failed';
+        console.error('Memory Init Failed:', err);
+    });
+
+// Health Check
+// 503 until memory is ready, so the supervisor only starts readers once the
+// writer has downloaded the model and created the shared index
+app.get('/health', (req, res) => {
+    res.status(memoryStatus === 'initialized' ? 200 : 503).json({
+        status: memoryStatus === 'initialized' ? 'online' : 'starting',
+        service: 'AI Brain (Exocortex)',
+        version: '1.0.0',
+        memory: memoryStatus,
+        worker: process.env.BRAIN_WORKER_ID || null,
+        pid: process.pid
+    });
+});
 
 // Memory Ingestion Endpoint
 app.post('/v1/memory', async (req, res) => {
     try {
         const { content, metadata } = req.body;
-        await hippocampus.addMemory(content, metadata);
+        if (memoryWriterUrl) {
+            // Only the writer worker mutates the shared index
+            await axios.post(`${memoryWriterUrl}/v1/memory`, { content, metadata });
+        } else {
+            await hippocampus.addMemory(content, metadata);
+        }
         res.json({ success: true, message: 'Memory stored.' });
     } catch (error: any) {
         res.status(500).json({ error: error.message });
@@ -63,7 +87,7 @@ app.post('/v1/memory', async (req, res) => {
 
 app.post('/v1/chat/completions', async (req, res) => {
     try {
-        const { model, messages } = req.body;
+        const { model, messages, format, max_tokens } = req.body;
 
         // RAG: Retrieve Context
         const lastMsg = messages[messages.length - 1].content;
@@ -82,7 +106,7 @@ app.post('/v1/chat/completions', async (req, res) => {
             }
         }
 
-        const reply = await broca.chat(messages, { model });
+        const reply = await broca.chat(messages, { model, format, maxTokens: max_tokens });
 
         res.json({
             id: 'chatcmpl-' + Date.now(),
@@ -104,7 +128,17 @@ app.post('/v1/chat/completions', async (req, res) => {
     }
 });
 
-app.listen(port, () => {
-    logger.info(`Brain Server running on port ${port}`, { service: 'SYSTEM' });
-    console.log(`Server running on http://localhost:${port}`);
-});
+if (listenFd) {
+    app.listen({ fd: Number(listenFd) }, () => {
+        logger.info(`Brain worker ${process.env.BRAIN_WORKER_ID} (pid ${process.pid}) accepting on shared socket`, { service: 'SYSTEM' });
+    });
+} else {
+    app.listen(port, () => {
+        logger.info(`Brain Server running on port ${port}`, { service: 'SYSTEM' });
+        console.log(`Server running on http://localhost:${port}`);
+    });
+}
+
+if (workerPort) {
+    app.listen(Number(workerPort), '127.0.0.1');
+}
@@ -9,6 +9,30 @@ interface Message {
 interface ChatOptions {
     model: string;
     temperature?: number;
+    format?: 'json' | Record<string, any>; // Ollama structured output (JSON mode or schema)
+    maxTokens?: number;
+}
+
+// Gemini's responseSchema accepts an OpenAPI subset; keep only the keys it understands
+const GEMINI_SCHEMA_KEYS = ['type', 'properties', 'required', 'enum', 'items', 'description'];
+
+function toGeminiSchema(schema: ChatOptions['format']): Record<string, any> | undefined {
+    if (!schema || typeof schema !== 'object') return undefined;
+    const result: Record<string, any> = {};
+    for (const key of GEMINI_SCHEMA_KEYS) {
+        if (schema[key] === undefined) continue;
+        if (key === 'properties') {
+            result.properties = {};
+            for (const [name, prop] of Object.entries(schema.properties)) {
+                result.properties[name] = toGeminiSchema(prop as Record<string, any>);
+            }
+        } else if (key === 'items') {
+            result.items = toGeminiSchema(schema.items);
+        } else {
+            result[key] = schema[key];
+        }
+    }
+    return result;
 }
 
 export class BrocaService {
@@ -24,20 +48,21 @@ export class BrocaService {
         const { model } = options;
 
         if (model.startsWith('gemini')) {
-            return this.callGemini(messages, model);
+            return this.callGemini(messages, model, options);
         } else {
-            return this.callOllama(messages, model);
+            return this.callOllama(messages, model, options);
         }
     }
 
-    private async callOllama(messages: Message[], model: string): Promise<string> {
+    private async callOllama(messages: Message[], model: string, options: Partial<ChatOptions> = {}): Promise<string> {
         try {
             logger.info(`Calling Ollama: ${model}`, { service: 'BROCA' });
             const response = await axios.post(`${this.ollamaUrl}/api/chat`, {
                 model: model,
                 messages: messages,
                 stream: false,
-                options: { temperature: 0.3 }
+                format: options.format,
+                options: { temperature: 0.3, num_predict: options.maxTokens }
             });
 
             return response.data.message.content;
@@ -54,7 +79,7 @@ export class BrocaService {
         }
     }
 
-    private async callGemini(messages: Message[], model: string): Promise<string> {
+    private async callGemini(messages: Message[], model: string, options: Partial<ChatOptions> = {}): Promise<string> {
         if (!this.geminiKey) throw new Error('GEMINI_API_KEY not set');
 
         try {
@@ -67,7 +92,12 @@ export class BrocaService {
 
             const response = await axios.post(url, {
                 contents: [{ parts: [{ text: prompt }] }],
-                generationConfig: { temperature: 0.3 }
+                generationConfig: {
+                    temperature: 0.3,
+                    responseMimeType: options.format ? 'application/json' : undefined,
+                    responseSchema: toGeminiSchema(options.format),
+                    maxOutputTokens: options.maxTokens
+                }
             });
 
             return response.data.candidates[0].content.parts[0].text;
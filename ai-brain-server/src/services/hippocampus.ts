@@ -1,32 +1,50 @@
 import { LocalIndex } from 'vectra';
+import fs from 'fs';
 import path from 'path';
 import { logger } from '../utils/logger';
 
 // Use a real embedding model or a mock/local one
 const MODEL_NAME = 'Xenova/all-MiniLM-L6-v2';
 
+interface HippocampusOptions {
+    // Reader workers reload the on-disk index when another process has written to it
+    reloadOnChange?: boolean;
+}
+
 export class HippocampusService {
     private index: LocalIndex;
     private pipeline: any; // Changed from extractor to pipeline
     private initialized: boolean = false;
+    private initPromise: Promise<void> | null = null;
+    private indexFolder: string;
+    private reloadOnChange: boolean;
+    private indexVersion: number = 0;
 
-    constructor() {
-        const indexFolder = path.join(process.cwd(), 'memory_index');
-        this.index = new LocalIndex(indexFolder);
+    constructor(options: HippocampusOptions = {}) {
+        this.indexFolder = path.join(process.cwd(), 'memory_index');
+        this.index = new LocalIndex(this.indexFolder);
+        this.reloadOnChange = options.reloadOnChange || false;
     }
 
-    async init() {
-        if (this.initialized) return;
+    // Concurrent callers share one load, so the model is only fetched once
+    init(): Promise<void> {
+        if (!this.initPromise) {
+            this.initPromise = this.load().catch(err => {
+                this.initPromise = null; // allow a retry
+                throw err;
+            });
+        }
+        return this.initPromise;
+    }
 
+    private async load() {
         logger.info('Loading Embedding Model (MiniLM)...', { service: 'HIPPOCAMPUS' });
         // @ts-ignore
         const { pipeline } = await import('@xenova/transformers');
         this.pipeline = await pipeline('feature-extraction', MODEL_NAME);
 
         logger.info('Checking Vector Index...', { service: 'HIPPOCAMPUS' });
-        const indexPath = path.join(process.cwd(), 'memory_index');
-
-        this.index = new LocalIndex(indexPath);
+        this.index = new LocalIndex(this.indexFolder);
 
         if (!await this.index.isIndexCreated()) {
             await this.index.createIndex();
@@ -43,19 +61,37 @@ export class HippocampusService {
 
         await this.index.insertItem({
             vector,
-            metadata: { text, timestamp: Date.now() }
+            metadata: { ...metadata, text, timestamp: Date.now() }
         });
         logger.info(`Memorized: "${text.substring(0, 20)}..."`, { service: 'HIPPOCAMPUS' });
     }
 
     async query(text: string, limit = 3) {
         if (!this.initialized) await this.init();
+        if (this.reloadOnChange) await this.refreshIndex();
         const vector = await this.getEmbedding(text); // Restore this line
         // queryItems(vector, queryText, limit)
         // Correct signature: (vector, text, limit)
         return await this.index.queryItems(vector, "", limit);
     }
 
+    private async refreshIndex() {
+        const stat = await fs.promises.stat(path.join(this.indexFolder, 'index.json')).catch(() => null);
+        if (!stat || stat.mtimeMs <= this.indexVersion) return; // Not written yet, or unchanged
+
+        // LocalIndex caches index.json in memory; a fresh instance re-reads it.
+        // The writer may be mid-write, so only swap once the new file loads.
+        const candidate = new LocalIndex(this.indexFolder);
+        try {
+            await candidate.listItems();
+        } catch (err: any) {
+            logger.warn(`Index reload failed, keeping previous index: ${err.message}`, { service: 'HIPPOCAMPUS' });
+            return;
+        }
+        this.index = candidate;
+        this.indexVersion = stat.mtimeMs;
+    }
+
     private async getEmbedding(text: string): Promise<number[]> {
         // @ts-ignore
         const output = await this.pipeline(text, { pooling: 'mean', normalize: true });
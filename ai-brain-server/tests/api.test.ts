@@ -24,8 +24,8 @@ jest.mock('../src/services/hippocampus', () => ({
     }))
 }));
 
-// Create test app
-const createTestApp = () => {
+// Create test app (memoryInit stands in for hippocampus.init() when given)
+const createTestApp = (memoryInit?: Promise<void>) => {
     const app = express();
     app.use(express.json());
 
@@ -36,13 +36,18 @@ const createTestApp = () => {
     const broca = new BrocaService();
     const hippocampus = new HippocampusService();
 
+    let memoryStatus = 'loading';
+    (memoryInit || hippocampus.init())
+        .then(() => { memoryStatus = 'initialized'; })
+        .catch(() => { memoryStatus = 'failed'; });
+
     // Health endpoint
     app.get('/health', (req, res) => {
-        res.json({
-            status: 'online',
+        res.status(memoryStatus === 'initialized' ? 200 : 503).json({
+            status: memoryStatus === 'initialized' ? 'online' : 'starting',
             service: 'AI Brain (Exocortex)',
             version: '1.0.0',
-            memory: 'initialized'
+            memory: memoryStatus
         });
     });
 
@@ -125,6 +130,23 @@ describe('Brain Server API', () => {
             expect(response.body.version).toBeDefined();
             expect(response.body.memory).toBe('initialized');
         });
+
+        test('should return 503 until memory has loaded', async () => {
+            const loadingApp = createTestApp(new Promise(() => {}));
+            const response = await request(loadingApp).get('/health');
+
+            expect(response.status).toBe(503);
+            expect(response.body.memory).toBe('loading');
+        });
+
+        test('should return 503 when memory failed to load', async () => {
+            const failedApp = createTestApp(Promise.reject(new Error('model download failed')));
+            await new Promise(resolve => setImmediate(resolve));
+            const response = await request(failedApp).get('/health');
+
+            expect(response.status).toBe(503);
+            expect(response.body.memory).toBe('failed');
+        });
     });
 
     describe('POST /v1/memory', () => {
@@ -46,6 +46,56 @@ describe('BrocaService', () => {
             await expect(broca.chat([{ role: 'user', content: 'Hi' }], { model: 'llama3.1:latest' }))
                 .rejects.toThrow('Network Error');
         });
+
+        test('should forward structured output schema and token cap', async () => {
+            mockedAxios.post.mockResolvedValue({
+                data: { message: { content: '{"value":"Akash","confidence":0.9,"skip":false}' } }
+            });
+            const schema = { type: 'object', properties: { value: { type: 'string' } } };
+
+            await broca.chat([{ role: 'user', content: 'First name?' }], { model: 'llama3.1:latest', format: schema, maxTokens: 64 });
+
+            expect(mockedAxios.post).toHaveBeenCalledWith(
+                expect.any(String),
+                expect.objectContaining({
+                    format: schema,
+                    options: expect.objectContaining({ num_predict: 64 })
+                })
+            );
+        });
+    });
+
+    describe('Gemini Integration', () => {
+        test('should pass a Gemini-compatible response schema', async () => {
+            process.env.GEMINI_API_KEY = 'test-key';
+            const gemini = new BrocaService();
+            delete process.env.GEMINI_API_KEY;
+            mockedAxios.post.mockResolvedValue({
+                data: { candidates: [{ content: { parts: [{ text: '{"value":"Akash","confidence":0.9,"skip":false}' } ] } }] }
+            });
+            const schema = {
+                type: 'object',
+                properties: {
+                    value: { type: 'string', enum: ['Akash'] },
+                    confidence: { type: 'number', minimum: 0, maximum: 1 }
+                },
+                required: ['value', 'confidence']
+            };
+
+            await gemini.chat([{ role: 'user', content: 'First name?' }], { model: 'gemini-2.0-flash', format: schema, maxTokens: 64 });
+
+            const body = mockedAxios.post.mock.calls[0][1] as any;
+            expect(body.generationConfig.responseMimeType).toBe('application/json');
+            expect(body.generationConfig.responseSchema).toEqual({
+                type: 'object',
+                properties: {
+                    value: { type: 'string', enum: ['Akash'] },
+                    confidence: { type: 'number' }
+                },
+                required: ['value', 'confidence']
+            });
+            expect(body.generationConfig.maxOutputTokens).toBe(64);
+        });
     });
 
     describe('Message Handling', () => {
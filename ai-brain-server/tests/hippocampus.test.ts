@@ -1,3 +1,5 @@
+import fs from 'fs';
+import { LocalIndex } from 'vectra';
 import { HippocampusService } from '../src/services/hippocampus';
 
 // Mock dependencies
@@ -6,6 +8,7 @@ jest.mock('vectra', () => ({
         isIndexCreated: jest.fn().mockResolvedValue(true),
         createIndex: jest.fn().mockResolvedValue(undefined),
         insertItem: jest.fn().mockResolvedValue(undefined),
+        listItems: jest.fn().mockResolvedValue([]),
         queryItems: jest.fn().mockResolvedValue([
             { item: { metadata: { text: 'Memory 1', score: 0.9 } }, score: 0.9 }
         ])
@@ -36,6 +39,13 @@ describe('HippocampusService', () => {
             await hippocampus.init();
             expect(true).toBe(true);
         });
+
+        test('should share one load between concurrent inits', async () => {
+            const { pipeline } = require('@xenova/transformers');
+            pipeline.mockClear();
+            await Promise.all([hippocampus.init(), hippocampus.init(), hippocampus.query('Who am I?')]);
+            expect(pipeline).toHaveBeenCalledTimes(1);
+        });
     });
 
     describe('Memory Storage', () => {
@@ -84,6 +94,45 @@ describe('HippocampusService', () => {
         });
     });
 
+    describe('Reader Mode', () => {
+        test('should query when the shared index has not been written yet', async () => {
+            const reader = new HippocampusService({ reloadOnChange: true });
+            await reader.init();
+            const results = await reader.query('Who am I?');
+            expect(results).toHaveLength(1);
+        });
+
+        test('should keep the previous index when the file changes mid-write', async () => {
+            const MockIndex = LocalIndex as unknown as jest.Mock;
+            const statSpy = jest.spyOn(fs.promises, 'stat');
+            const reader = new HippocampusService({ reloadOnChange: true });
+            await reader.init();
+
+            statSpy.mockResolvedValueOnce({ mtimeMs: 1000 } as any);
+            expect((await reader.query('Who am I?'))[0].item.metadata.text).toBe('Memory 1');
+
+            // Writer is mid-write: the new index.json does not parse
+            MockIndex.mockImplementationOnce(() => ({
+                listItems: jest.fn().mockRejectedValue(new SyntaxError('Unexpected end of JSON input')),
+                queryItems: jest.fn()
+            }));
+            statSpy.mockResolvedValueOnce({ mtimeMs: 2000 } as any);
+            expect((await reader.query('Who am I?'))[0].item.metadata.text).toBe('Memory 1');
+
+            // Write finished: the same mtime is reloaded on the next query
+            MockIndex.mockImplementationOnce(() => ({
+                listItems: jest.fn().mockResolvedValue([]),
+                queryItems: jest.fn().mockResolvedValue([
+                    { item: { metadata: { text: 'Memory 2' } }, score: 0.8 }
+                ])
+            }));
+            statSpy.mockResolvedValueOnce({ mtimeMs: 2000 } as any);
+            expect((await reader.query('Who am I?'))[0].item.metadata.text).toBe('Memory 2');
+
+            statSpy.mockRestore();
+        });
+    });
+
     describe('RAG Integration', () => {
         test('should retrieve memories for form filling context', async () => {
             await hippocampus.init();
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+🔥 AI Brain Server - Load Test
+==============================
+
+Simulates concurrent auto-apply sessions against the Brain server and
+reports throughput, latency percentiles, error rates and server RSS.
+
+Each session walks a job form the way the extension does: a /logs entry
+and a /v1/chat/completions call per field (with the structured-output
+schema and token cap), think time between fields, and a /v1/memory
+"Learn" burst at the end. Ollama is replaced by a local stub with a
+fixed generation delay, so results measure the Brain server itself.
+
+Usage:
+    python3 tests/load_test.py --spawn                    # Build first: npm run build
+    python3 tests/load_test.py --spawn --stages 1,4,16,64 # Ramp to find saturation
+    python3 tests/load_test.py --url http://localhost:3000 --pid 1234
+    python3 tests/load_test.py --spawn --json results.json
+
+--spawn runs the real server, so the first run downloads the MiniLM
+embedding model. It runs from a temporary directory, so the fake
+"learned_qna" memories go to a throwaway memory_index that is deleted
+afterwards. Point an already running server at the stub with
+OLLAMA_URL=http://127.0.0.1:11435 (the stub port) before using --url.
+
+WARNING: with --url the "Learn" bursts write fake memories into that
+server's memory_index, and RAG will inject them into real autofills.
+Only use --url against a server started from a scratch directory.
+
+Requirements:
+    - Python 3.8+ (standard library only)
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+# ============================================================================
+# Configuration
+# ============================================================================
+
+BRAIN_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PORT = 3300
+STUB_PORT = 11435
+MODEL = 'llama3.2:3b'
+
+# (label, type, weight) - roughly the mix of fields on ATS forms that miss the
+# direct-match fast path and reach the AI
+FIELD_MIX = [
+    ('Current Job Title', 'text', 10),
+    ('Years of experience with Python', 'number', 8),
+    ('Expected Salary', 'text', 8),
+    ('Notice Period', 'text', 6),
+    ('Are you authorized to work in this country?', 'select', 8),
+    ('Will you now or in the future require sponsorship?', 'select', 8),
+    ('Willing to relocate?', 'radio', 5),
+    ('How did you hear about us?', 'select', 5),
+    ('Current Company', 'text', 6),
+    ('Highest level of education', 'select', 4),
+    ('Why do you want to work here?', 'textarea', 4),
+    ('Tell us about a project you are proud of', 'textarea', 3),
+    ('Professional Summary', 'textarea', 3),
+    ('Gender', 'select', 2),
+    ('LinkedIn Profile', 'url', 3),
+]
+SELECT_OPTIONS = ['Yes', 'No', 'Prefer not to say']
+
+# ============================================================================
+# Minimal asyncio HTTP
+# ============================================================================
+
+async def http_request(host: str, port: int, method: str, path: str,
+                       body: Optional[dict] = None, timeout: float = 60) -> Tuple[int, bytes]:
+    """Send one HTTP/1.1 request (Connection: close) and return (status, body)."""
+    payload = json.dumps(body).encode() if body is not None else b''
+    head = (f'{method} {path} HTTP/1.1\r\nHost: {host}:{port}\r\n'
+            f'Content-Type: application/json\r\nContent-Length: {len(payload)}\r\n'
+            f'Connection: close\r\n\r\n').encode()
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            writer.write(head + payload)
+            await writer.drain()
+            return await reader.read()
+        finally:
+            writer.close()
+
+    raw = await asyncio.wait_for(exchange(), timeout)
+    header, _, content = raw.partition(b'\r\n\r\n')
+    status = int(header.split(b' ', 2)[1]) if header else 0
+    return status, content
+
+# ============================================================================
+# Ollama Stub
+# ============================================================================
+
+class OllamaStub:
+    """Answers /api/chat after a fixed delay, honouring structured-output requests."""
+
+    def __init__(self, port: int, latency: float):
+        self.port = port
+        self.latency = latency
+        self.requests = 0
+        self.server: Optional[asyncio.AbstractServer] = None
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            header = await reader.readuntil(b'\r\n\r\n')
+            length = 0
+            for line in header.split(b'\r\n'):
+                if line.lower().startswith(b'content-length:'):
+                    length = int(line.split(b':', 1)[1])
+            body = json.loads(await reader.readexactly(length) or b'{}')
+            path = header.split(b' ', 2)[1].decode()
+
+            if path == '/api/chat':
+                self.requests += 1
+                await asyncio.sleep(self.latency)
+                if body.get('format'):
+                    content = json.dumps({'value': 'Yes', 'confidence': 0.9, 'skip': False})
+                else:
+                    content = 'Yes'
+                reply = {'model': body.get('model'), 'message': {'role': 'assistant', 'content': content}, 'done': True}
+            else:
+                reply = {'models': [{'name': MODEL}]}
+
+            data = json.dumps(reply).encode()
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+                         + f'Content-Length: {len(data)}\r\nConnection: close\r\n\r\n'.encode() + data)
+            await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, '127.0.0.1', self.port, backlog=1024)
+
+    def stop(self):
+        if self.server:
+            self.server.close()
+
+# ============================================================================
+# Server Process & RSS
+# ============================================================================
+
+def read_rss_mb(pid: int) -> Optional[float]:
+    """Resident set size of a process in MB (Linux /proc, else ps)."""
+    status = Path(f'/proc/{pid}/status')
+    try:
+        if status.exists():
+            for line in status.read_text().splitlines():
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+            return None
+        out = subprocess.run(['ps', '-o', 'rss=', '-p', str(pid)], capture_output=True, text=True).stdout.strip()
+        return int(out) / 1024 if out else None
+    except (OSError, ValueError):
+        return None
+
+def spawn_server(port: int, stub_port: int, workdir: Path) -> subprocess.Popen:
+    """Start the built Brain server with Ollama pointed at the stub.
+
+    The server keeps its memory_index (and debug.log) in its working
+    directory, so workdir keeps the test's memories out of the real index.
+    """
+    entry = BRAIN_DIR / 'dist' / 'index.js'
+    if not entry.exists():
+        sys.exit(f'✗ {entry} not found. Run: cd ai-brain-server && npm run build')
+    env = {**os.environ, 'PORT': str(port), 'OLLAMA_URL': f'http://127.0.0.1:{stub_port}'}
+    return subprocess.Popen(['node', str(entry)], cwd=workdir, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+async def wait_for_health(host: str, port: int, timeout: float = 120) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            status, _ = await http_request(host, port, 'GET', '/health', timeout=2)
+            if status == 200:
+                return True
+        except (OSError, asyncio.TimeoutError):
+            pass
+        await asyncio.sleep(1)
+    return False
+
+# ============================================================================
+# Sessions & Metrics
+# ============================================================================
+
+class Metrics:
+    """Latencies and errors per endpoint for one stage."""
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+        self.started = time.monotonic()
+        self.finished: Optional[float] = None
+
+    def record(self, endpoint: str, latency: float, ok: bool):
+        self.latencies.setdefault(endpoint, []).append(latency)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self) -> dict:
+        duration = (self.finished or time.monotonic()) - self.started
+        endpoints = {}
+        for endpoint, values in sorted(self.latencies.items()):
+            values = sorted(values)
+            endpoints[endpoint] = {
+                'requests': len(values),
+                'errors': self.errors.get(endpoint, 0),
+                'p50_ms': percentile(values, 50) * 1000,
+                'p90_ms': percentile(values, 90) * 1000,
+                'p99_ms': percentile(values, 99) * 1000,
+                'max_ms': values[-1] * 1000,
+            }
+        total = sum(e['requests'] for e in endpoints.values())
+        errors = sum(e['errors'] for e in endpoints.values())
+        return {
+            'duration_s': duration,
+            'requests': total,
+            'throughput_rps': total / duration if duration else 0,
+            'error_rate': errors / total if total else 0,
+            'endpoints': endpoints,
+        }
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+def field_prompt(label: str, field_type: str) -> dict:
+    """Chat request shaped like the extension's structured field fill."""
+    options = SELECT_OPTIONS if field_type in ('select', 'radio') else []
+    value_schema = {'type': 'string', 'enum': options} if options else {'type': 'string'}
+    is_long = field_type == 'textarea'
+    prompt = (f'Task: Fill this form field accurately using the User Profile.\n\n'
+              f'Field to Fill:\n- Label: "{label}"\n- Type: "{field_type}"'
+              + (f'\n- Options: {json.dumps(options)}' if options else '')
+              + '\n\nUser Profile:\n{"personal": {"firstName": "Test", "lastName": "User"}}')
+    return {
+        'model': MODEL,
+        'messages': [{'role': 'user', 'content': prompt}],
+        'stream': False,
+        'format': {
+            'type': 'object',
+            'properties': {'value': value_schema, 'confidence': {'type': 'number'}, 'skip': {'type': 'boolean'}},
+            'required': ['value', 'confidence', 'skip'],
+        },
+        'max_tokens': 400 if is_long else 64,
+    }
+
+async def timed(metrics: Metrics, host: str, port: int, endpoint: str, body: dict):
+    start = time.monotonic()
+    try:
+        status, _ = await http_request(host, port, 'POST', endpoint, body)
+        ok = 200 <= status < 300
+    except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+        ok = False
+    metrics.record(endpoint, time.monotonic() - start, ok)
+
+async def auto_apply_session(metrics: Metrics, host: str, port: int, deadline: float, rng: random.Random):
+    """Fill forms back to back until the stage deadline."""
+    labels = [(label, kind) for label, kind, _ in FIELD_MIX]
+    weights = [weight for _, _, weight in FIELD_MIX]
+    while time.monotonic() < deadline:
+        fields = rng.choices(labels, weights=weights, k=rng.randint(5, 15))
+        for label, kind in fields:
+            if time.monotonic() >= deadline:
+                return
+            await timed(metrics, host, port, '/logs', {
+                'level': 'info', 'service': 'EXTENSION', 'message': f'[AutoFill] Processing field: "{label}"'
+            })
+            await timed(metrics, host, port, '/v1/chat/completions', field_prompt(label, kind))
+            # content.js waits 500ms after AI fills; add jitter so sessions drift apart
+            await asyncio.sleep(rng.uniform(0.3, 0.7))
+        # "Learn" after submitting: store a few answers as memories
+        for label, _ in fields[:3]:
+            await timed(metrics, host, port, '/v1/memory', {
+                'content': f'Form Question: "{label}"\nMy Answer: "Yes"',
+                'metadata': {'type': 'learned_qna', 'question': label, 'answer': 'Yes'},
+            })
+
+async def sample_rss(pids: List[int], samples: List[Tuple[float, float]], started: float, interval: float):
+    while True:
+        values = [read_rss_mb(pid) for pid in pids]
+        samples.append((time.monotonic() - started, sum(v for v in values if v)))
+        await asyncio.sleep(interval)
+
+# ============================================================================
+# Reporting
+# ============================================================================
+
+def print_stage(sessions: int, summary: dict):
+    print(f'\n▶ {sessions} concurrent sessions  '
+          f'{summary["throughput_rps"]:.1f} req/s  '
+          f'errors {summary["error_rate"] * 100:.1f}%  '
+          f'({summary["requests"]} requests in {summary["duration_s"]:.0f}s)')
+    print(f'  {"endpoint":<22}{"reqs":>7}{"errs":>6}{"p50 ms":>9}{"p90 ms":>9}{"p99 ms":>9}{"max ms":>9}')
+    for endpoint, e in summary['endpoints'].items():
+        print(f'  {endpoint:<22}{e["requests"]:>7}{e["errors"]:>6}'
+              f'{e["p50_ms"]:>9.0f}{e["p90_ms"]:>9.0f}{e["p99_ms"]:>9.0f}{e["max_ms"]:>9.0f}')
+
+def print_rss(samples: List[Tuple[float, float]]):
+    if not samples or not any(rss for _, rss in samples):
+        print('\nServer RSS: not sampled (use --spawn or --pid)')
+        return
+    step = max(1, len(samples) // 12)
+    print('\nServer RSS over time:')
+    for elapsed, rss in samples[::step]:
+        print(f'  {elapsed:7.0f}s  {rss:8.1f} MB')
+    print(f'  peak      {max(rss for _, rss in samples):8.1f} MB')
+
+def print_saturation(results: List[dict]):
+    """Point out the stage after which throughput stopped scaling."""
+    if len(results) < 2:
+        return
+    for previous, current in zip(results, results[1:]):
+        gain = current['throughput_rps'] / previous['throughput_rps'] if previous['throughput_rps'] else 0
+        expected = current['sessions'] / previous['sessions']
+        if gain < 1 + 0.5 * (expected - 1) or current['error_rate'] > 0.01:
+            print(f'\n⚠ Saturation around {previous["sessions"]} sessions '
+                  f'({previous["throughput_rps"]:.1f} req/s); at {current["sessions"]} throughput '
+                  f'rose only {gain:.2f}x with {current["error_rate"] * 100:.1f}% errors')
+            return
+    print(f'\n✓ No saturation up to {results[-1]["sessions"]} sessions')
+
+# ============================================================================
+# Main
+# ============================================================================
+
+async def run(args) -> dict:
+    stub = OllamaStub(args.stub_port, args.stub_latency)
+    await stub.start()
+
+    server = None
+    workdir = None
+    pids = list(args.pid or [])
+    if args.spawn:
+        host, port = '127.0.0.1', args.port
+        workdir = tempfile.TemporaryDirectory(prefix='brain-load-test-')
+        server = spawn_server(port, args.stub_port, Path(workdir.name))
+        pids.append(server.pid)
+    else:
+        parsed = urlparse(args.url)
+        host, port = parsed.hostname or '127.0.0.1', parsed.port or 80
+        print(f'⚠ Memory bursts will write test memories into the memory_index of {args.url}')
+
+    rss_samples: List[Tuple[float, float]] = []
+    sampler = None
+    try:
+        print(f'Waiting for Brain server at {host}:{port}...')
+        if not await wait_for_health(host, port):
+            sys.exit('✗ Brain server did not become healthy')
+
+        started = time.monotonic()
+        if pids:
+            sampler = asyncio.ensure_future(sample_rss(pids, rss_samples, started, args.rss_interval))
+
+        results = []
+        for sessions in args.stages:
+            metrics = Metrics()
+            deadline = time.monotonic() + args.duration
+            rng = random.Random(args.seed + sessions)
+            await asyncio.gather(*[
+                auto_apply_session(metrics, host, port, deadline, random.Random(rng.random()))
+                for _ in range(sessions)
+            ])
+            metrics.finished = time.monotonic()
+            summary = {'sessions': sessions, **metrics.summary()}
+            results.append(summary)
+            print_stage(sessions, summary)
+
+        print_rss(rss_samples)
+        print_saturation(results)
+        print(f'\nOllama stub served {stub.requests} chat requests')
+        return {'stages': results, 'rss_mb': rss_samples, 'stub_latency_s': args.stub_latency}
+    finally:
+        if sampler:
+            sampler.cancel()
+        stub.stop()
+        if server:
+            server.terminate()
+            server.wait()
+        if workdir:
+            workdir.cleanup()
+
+def main():
+    parser = argparse.ArgumentParser(description='AI Brain Server - Load Test')
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument('--spawn', action='store_true', help='Start dist/index.js against the Ollama stub')
+    target.add_argument('--url', default='http://127.0.0.1:3000', help='Already running Brain server (its memory_index receives test memories)')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='Port for --spawn')
+    parser.add_argument('--pid', type=int, action='append', help='Server PID(s) to sample RSS from (repeatable)')
+    parser.add_argument('--stages', default='1,4,16',
+                        help='Comma-separated concurrent session counts, run in order (default: 1,4,16)')
+    parser.add_argument('--duration', type=float, default=30, help='Seconds per stage')
+    parser.add_argument('--stub-port', type=int, default=STUB_PORT)
+    parser.add_argument('--stub-latency', type=float, default=0.05, help='Simulated Ollama generation time (s)')
+    parser.add_argument('--rss-interval', type=float, default=1.0)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--json', type=Path, help='Also write results to this file')
+    args = parser.parse_args()
+    args.stages = [int(s) for s in args.stages.split(',') if s.strip()]
+
+    results = asyncio.run(run(args))
+    if args.json:
+        args.json.write_text(json.dumps(results, indent=2))
+        print(f'Results written to {args.json}')
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        print('\nLoad test cancelled.')
+        sys.exit(1)
@@ -23,6 +23,15 @@ async function loadData() {
     });
 }
 
+// Runs read-modify-write updates of one storage key one at a time, so concurrent
+// handlers can't overwrite each other with stale snapshots
+const storageQueues = {};
+function withStorageLock(key, task) {
+    const run = (storageQueues[key] || Promise.resolve()).then(task);
+    storageQueues[key] = run.catch(() => { });
+    return run;
+}
+
 function getNestedValue(obj, path) {
     const result = path.split('.').reduce((current, key) => current?.[key], obj);
     return result;
@@ -139,7 +148,8 @@ function findDirectMatch(fieldInfo, data) {
 }
 
 // 4. CORE AI LOGIC (Ollama Direct)
-async function callOllamaAPI_Direct(prompt, jsonMode, model) {
+// options.format: JSON schema for structured output, options.numPredict: max tokens to generate
+async function callOllamaAPI_Direct(prompt, jsonMode, model, options = {}) {
     const data = await loadData();
     const settings = data.settings || {};
     const url = settings.ollamaUrl || 'http://localhost:11434';
@@ -164,8 +174,8 @@ async function callOllamaAPI_Direct(prompt, jsonMode, model) {
                 model: selectedModel,
                 messages: messages,
                 stream: false,
-                format: jsonMode ? 'json' : undefined,
-                options: { temperature: 0.1 }
+                format: options.format || (jsonMode ? 'json' : undefined),
+                options: { temperature: 0.1, num_predict: options.numPredict }
             }),
             signal: controller.signal
         });
@@ -181,7 +191,7 @@ async function callOllamaAPI_Direct(prompt, jsonMode, model) {
 }
 
 // 5. Brain Server Logic (Optional - provides RAG/Memory for smarter answers)
-async function callBrainAPI(prompt, jsonMode, model, brainUrl) {
+async function callBrainAPI(prompt, jsonMode, model, brainUrl, options = {}) {
     const baseUrl = brainUrl || DEFAULT_BRAIN_URL;
     const apiUrl = `${baseUrl}/v1/chat/completions`;
     
@@ -197,7 +207,9 @@ async function callBrainAPI(prompt, jsonMode, model, brainUrl) {
             body: JSON.stringify({
                 messages: [{ role: 'user', content: Array.isArray(prompt) ? prompt[0].text : prompt }],
                 model: model || 'llama3.1:latest',
-                stream: false
+                stream: false,
+                format: options.format || (jsonMode ? 'json' : undefined),
+                max_tokens: options.numPredict
             }),
             signal: controller.signal
         });
@@ -209,7 +221,7 @@ async function callBrainAPI(prompt, jsonMode, model, brainUrl) {
         return result;
     } catch (e) {
         Logger.warn('[AI Brain] Server unavailable, falling back to direct Ollama.', e.message);
-        return callOllamaAPI_Direct(prompt, jsonMode, model);
+        return callOllamaAPI_Direct(prompt, jsonMode, model, options);
     }
 }
 
@@ -225,13 +237,36 @@ async function storeBrainMemory(content, metadata, brainUrl) {
         if (response.ok) {
             Logger.info('[AI Brain] Memory stored successfully');
         }
+        return response.ok;
     } catch (e) {
         Logger.debug('[AI Brain] Memory storage failed (server may be offline)', e.message);
+        return false;
     }
 }
 
+// Gemini's responseSchema accepts an OpenAPI subset; keep only the keys it understands
+const GEMINI_SCHEMA_KEYS = ['type', 'properties', 'required', 'enum', 'items', 'description'];
+
+function toGeminiSchema(schema) {
+    if (!schema || typeof schema !== 'object') return undefined;
+    const result = {};
+    for (const key of GEMINI_SCHEMA_KEYS) {
+        if (schema[key] === undefined) continue;
+        if (key === 'properties') {
+            result.properties = Object.fromEntries(
+                Object.entries(schema.properties).map(([name, prop]) => [name, toGeminiSchema(prop)])
+            );
+        } else if (key === 'items') {
+            result.items = toGeminiSchema(schema.items);
+        } else {
+            result[key] = schema[key];
+        }
+    }
+    return result;
+}
+
 // 5a. Gemini Direct Logic
-async function callGeminiAPI_Direct(prompt, apiKey) {
+async function callGeminiAPI_Direct(prompt, apiKey, options = {}) {
     // Basic checks
     if (!apiKey) throw new Error('Gemini API Key missing');
 
@@ -250,7 +285,10 @@ async function callGeminiAPI_Direct(prompt, apiKey) {
     const body = {
         contents: [{ parts: [{ text: textPrompt }] }],
         generationConfig: {
-            temperature: 0.2
+            temperature: 0.2,
+            responseMimeType: options.format ? 'application/json' : undefined,
+            responseSchema: toGeminiSchema(options.format),
+            maxOutputTokens: options.numPredict
         }
     };
 
@@ -276,15 +314,16 @@ async function callGeminiAPI_Direct(prompt, apiKey) {
 }
 
 // 6. Unified AI Router
-async function callAI(prompt, jsonMode) {
+// options.skipMemory: bypass the Brain so no RAG memories are injected into the prompt
+async function callAI(prompt, jsonMode, options = {}) {
     const data = await loadData();
     const settings = data.settings || {};
 
     // 1. Brain Server (Highest Priority if manually enabled)
     // Brain Server adds RAG memory for more context-aware, less vague answers
-    if (settings.useAIBrain) {
+    if (settings.useAIBrain && !options.skipMemory) {
         Logger.info('[AI Router] Using AI Brain Server (RAG enabled)');
-        return callBrainAPI(prompt, jsonMode, settings.ollamaModel, settings.brainUrl);
+        return callBrainAPI(prompt, jsonMode, settings.ollamaModel, settings.brainUrl, options);
     }
 
     // 2. Gemini Direct (If API Key is present AND Local is disabled/not preferred)
@@ -297,11 +336,11 @@ async function callAI(prompt, jsonMode) {
     // Let's check `settings.useLocalModel`.
 
     if (settings.geminiApiKey && !settings.useLocalModel) {
-        return callGeminiAPI_Direct(prompt, settings.geminiApiKey);
+        return callGeminiAPI_Direct(prompt, settings.geminiApiKey, options);
     }
 
     // 3. Default to Ollama
-    return callOllamaAPI_Direct(prompt, jsonMode, settings.ollamaModel);
+    return callOllamaAPI_Direct(prompt, jsonMode, settings.ollamaModel, options);
 }
 
 // 7a. Resume Parsing Utilities
@@ -398,7 +437,225 @@ function normalizeResumeData(data) {
     return normalized;
 }
 
-// 7b. AI Processing
+// 7b. Chunked Resume Pipeline
+// Long resumes are split into sections, each extracted with its own small prompt,
+// so parse time grows with section count instead of prompt length.
+const RESUME_SECTION_CONCURRENCY = 2;
+const RESUME_CHUNK_MIN_LENGTH = 1500;
+
+const RESUME_SECTION_HEADINGS = {
+    contact: /^(contact( information| details)?|personal (information|details)|(professional )?summary|profile|about( me)?|objective)$/,
+    experience: /^((work|professional|employment|relevant) )?(experience|history)$|^employment( history)?$|^career history$/,
+    education: /^(education( and training)?|academic (background|qualifications)|qualifications)$/,
+    skills: /^((technical|core|key) )?(skills|competencies)( and (tools|technologies))?$|^technologies$|^tools$/
+};
+
+const RESUME_SECTION_SCHEMAS = {
+    contact: `{
+  "profile": {
+    "personal": {
+      "firstName": "<first name>",
+      "lastName": "<last name>",
+      "email": "<email>",
+      "phone": "<phone>",
+      "linkedIn": "<linkedin>",
+      "github": "<github>",
+      "portfolio": null
+    },
+    "address": {
+      "city": "<city>",
+      "state": "<state>",
+      "country": "<country>"
+    },
+    "summary": "<summary>"
+  }
+}`,
+    experience: `{
+  "experience": [
+    {
+      "company": "<company>",
+      "title": "<title>",
+      "location": "<location>",
+      "startDate": "<start>",
+      "endDate": "<end>",
+      "current": true/false,
+      "description": "<desc>"
+    }
+  ]
+}`,
+    education: `{
+  "education": [
+    {
+      "institution": "<school>",
+      "degree": "<degree>",
+      "field": "<field>",
+      "startDate": "<start>",
+      "endDate": "<end>",
+      "gpa": "<gpa>"
+    }
+  ]
+}`,
+    skills: `{
+  "skills": {
+    "technical": ["<skill>"],
+    "languages": ["<lang>"],
+    "soft": ["<soft>"]
+  }
+}`
+};
+
+function detectResumeHeading(line) {
+    const heading = line.replace(/[^a-zA-Z& ]/g, '').replace(/&/g, 'and').replace(/\s+/g, ' ').trim().toLowerCase();
+    if (!heading || heading.length > 40) return null;
+    for (const [section, pattern] of Object.entries(RESUME_SECTION_HEADINGS)) {
+        if (pattern.test(heading)) return section;
+    }
+    return null;
+}
+
+function splitResumeSections(text) {
+    // Text before the first recognised heading is the contact header.
+    // Unrecognised headings (projects, awards, ...) stay with the current section.
+    const sections = {};
+    let current = 'contact';
+    for (const line of (text || '').split(/\r?\n/)) {
+        const heading = detectResumeHeading(line);
+        if (heading) {
+            current = heading;
+            continue;
+        }
+        sections[current] = sections[current] ? `${sections[current]}\n${line}` : line;
+    }
+    for (const key of Object.keys(sections)) {
+        sections[key] = sections[key].trim();
+        if (!sections[key]) delete sections[key];
+    }
+    return sections;
+}
+
+function parseJsonResponse(result) {
+    let jsonStr = result.trim();
+    if (jsonStr.startsWith('```')) jsonStr = jsonStr.replace(/^```json?\n?/, '').replace(/\n?```$/, '');
+    const firstCurly = jsonStr.indexOf('{');
+    const lastCurly = jsonStr.lastIndexOf('}');
+    if (firstCurly !== -1 && lastCurly !== -1) jsonStr = jsonStr.substring(firstCurly, lastCurly + 1);
+    return JSON.parse(jsonStr);
+}
+
+async function runWithConcurrency(items, limit, worker) {
+    const results = new Array(items.length);
+    let next = 0;
+    const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await worker(items[index], index);
+        }
+    });
+    await Promise.all(runners);
+    return results;
+}
+
+async function extractResumeSection(section, text) {
+    const prompt = `TASK: Extract the ${section.toUpperCase()} section of a resume into JSON.
+
+SECTION:
+${text}
+
+Fill in this JSON structure using only the section above:
+${RESUME_SECTION_SCHEMAS[section]}
+
+Return ONLY JSON. No explanations.`;
+
+    // Skip the Brain: its RAG would inject other resume sections (including the ones
+    // this import is storing) into the prompt
+    const result = await callAI(prompt, true, { skipMemory: true });
+    if (!result) throw new Error(`No response from AI for ${section}`);
+    return parseJsonResponse(result);
+}
+
+function mergeResumeSections(parts) {
+    const merged = {
+        profile: { personal: {}, address: {}, summary: '' },
+        experience: [],
+        education: [],
+        skills: { technical: [], languages: [], soft: [] }
+    };
+
+    for (const part of parts) {
+        if (!part) continue;
+        if (part.profile) {
+            Object.assign(merged.profile.personal, part.profile.personal || {});
+            if (part.profile.address && typeof part.profile.address === 'object') {
+                Object.assign(merged.profile.address, part.profile.address);
+            }
+            merged.profile.summary = merged.profile.summary || part.profile.summary || '';
+        }
+        for (const key of ['experience', 'education']) {
+            if (!part[key]) continue;
+            merged[key].push(...(Array.isArray(part[key]) ? part[key] : [part[key]]));
+        }
+        if (part.skills) {
+            for (const key of Object.keys(merged.skills)) {
+                const value = part.skills[key];
+                if (value) merged.skills[key].push(...(Array.isArray(value) ? value : [value]));
+            }
+        }
+    }
+    return merged;
+}
+
+// Stores a resume section in the Brain unless identical content was stored before
+// (hashes of stored sections are kept under RESUME_MEMORY_KEY)
+const RESUME_MEMORY_KEY = 'brainResumeSections';
+
+async function storeResumeSectionMemory(section, text, brainUrl) {
+    const contentHash = await hashText(text);
+    const result = await chrome.storage.local.get(RESUME_MEMORY_KEY);
+    const stored = result[RESUME_MEMORY_KEY] || {};
+    if ((stored[section] || []).includes(contentHash)) {
+        Logger.debug(`[Resume] Section "${section}" already in Brain memory, skipping`);
+        return;
+    }
+
+    const ok = await storeBrainMemory(`Resume ${section}:\n${text}`, { type: 'resume_section', section, contentHash }, brainUrl);
+    if (!ok) return;
+
+    // Sections are stored concurrently; record the hash under the lock so none is lost
+    await withStorageLock(RESUME_MEMORY_KEY, async () => {
+        const latest = (await chrome.storage.local.get(RESUME_MEMORY_KEY))[RESUME_MEMORY_KEY] || {};
+        latest[section] = [...(latest[section] || []), contentHash];
+        await chrome.storage.local.set({ [RESUME_MEMORY_KEY]: latest });
+    });
+}
+
+async function parseResumeInSections(sections) {
+    const data = await loadData();
+    const settings = data.settings || {};
+    const entries = Object.entries(sections);
+    Logger.info(`[Resume] Parsing ${entries.length} sections (concurrency: ${RESUME_SECTION_CONCURRENCY})`);
+
+    const parts = await runWithConcurrency(entries, RESUME_SECTION_CONCURRENCY, async ([section, text]) => {
+        // Feed each section to the Brain as a typed memory while it is being extracted
+        const stored = settings.useAIBrain
+            ? storeResumeSectionMemory(section, text, settings.brainUrl).catch(e => Logger.debug('[Resume] Memory store failed', e.message))
+            : Promise.resolve();
+        try {
+            return await extractResumeSection(section, text);
+        } catch (e) {
+            Logger.warn(`[Resume] Section "${section}" failed`, e.message);
+            return null;
+        } finally {
+            await stored;
+        }
+    });
+
+    if (parts.every(part => !part)) {
+        return { success: false, error: 'Could not extract any resume section' };
+    }
+    return { success: true, data: normalizeResumeData(mergeResumeSections(parts)) };
+}
+
+// 7c. AI Processing
 async function parseResumeWithAI(input) {
     let prompt;
     const getSystemInstruction = (resumeText) => `TASK: Extract information from the following resume into JSON.
@@ -464,6 +721,10 @@ Return ONLY JSON. No explanations.`;
         prompt = [{ text: "Extract resume data from this PDF into JSON." }, { inlineData: { mimeType: input.mimeType, data: input.resumeData } }];
     } else {
         const text = input.resumeText || input;
+        const sections = splitResumeSections(text);
+        if (text.length >= RESUME_CHUNK_MIN_LENGTH && Object.keys(sections).length > 1) {
+            return parseResumeInSections(sections);
+        }
         prompt = getSystemInstruction(text);
     }
 
@@ -471,13 +732,7 @@ Return ONLY JSON. No explanations.`;
         const result = await callAI(prompt, true);
         if (!result) return { success: false, error: 'No response from AI' };
 
-        let jsonStr = result.trim();
-        if (jsonStr.startsWith('```')) jsonStr = jsonStr.replace(/^```json?\n?/, '').replace(/\n?```$/, '');
-        const firstCurly = jsonStr.indexOf('{');
-        const lastCurly = jsonStr.lastIndexOf('}');
-        if (firstCurly !== -1 && lastCurly !== -1) jsonStr = jsonStr.substring(firstCurly, lastCurly + 1);
-
-        let parsedData = JSON.parse(jsonStr);
+        let parsedData = parseJsonResponse(result);
         parsedData = normalizeResumeData(parsedData);
 
         return { success: true, data: parsedData };
@@ -551,8 +806,157 @@ async function learnFromFieldsHandler(newFields) {
     }
 }
 
+// 7d. Job Posting Cache
+// Keyed by canonical posting URL + JD content hash so retries and repeat visits
+// reuse the extracted JD, match analysis and cover letter without new LLM calls.
+// Lookups write lastUsed back, so every read and write goes through withStorageLock.
+const JOB_CACHE_KEY = 'jobPostingCache';
+const JOB_CACHE_MAX_ENTRIES = 50;
+const JOB_CACHE_TTL = 7 * 24 * 3600000; // 7 days
+const TRACKING_PARAMS = /^(utm_.*|gclid|fbclid|msclkid|ref|referrer|src|source|trk|trackingid|refid|gh_src|lever-source)$/i;
+
+function canonicalPostingUrl(url) {
+    try {
+        const parsed = new URL(url);
+        const params = [...parsed.searchParams.entries()]
+            .filter(([key]) => !TRACKING_PARAMS.test(key))
+            .sort(([a], [b]) => a.localeCompare(b));
+        const query = params.length > 0 ? `?${new URLSearchParams(params).toString()}` : '';
+        const path = parsed.pathname.replace(/\/+$/, '') || '/';
+        return `${parsed.protocol}//${parsed.host.toLowerCase()}${path}${query}`;
+    } catch (e) {
+        return url || '';
+    }
+}
+
+async function hashText(text) {
+    const normalized = (text || '').replace(/\s+/g, ' ').trim();
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(normalized));
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('').substring(0, 16);
+}
+
+async function loadJobCache() {
+    const result = await chrome.storage.local.get(JOB_CACHE_KEY);
+    return result[JOB_CACHE_KEY] || {};
+}
+
+// Without jobDescription, returns the most recently used entry for the URL
+async function getJobCacheEntry(url, jobDescription) {
+    return withStorageLock(JOB_CACHE_KEY, async () => {
+        const cache = await loadJobCache();
+        const postingUrl = canonicalPostingUrl(url);
+        let key = null;
+
+        if (jobDescription) {
+            key = `${postingUrl}#${await hashText(jobDescription)}`;
+        } else {
+            const candidates = Object.keys(cache).filter(k => cache[k].url === postingUrl);
+            candidates.sort((a, b) => cache[b].lastUsed - cache[a].lastUsed);
+            key = candidates[0] || null;
+        }
+
+        const entry = key ? cache[key] : null;
+        if (!entry) return null;
+        if (Date.now() - entry.created > JOB_CACHE_TTL) {
+            delete cache[key];
+            await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+            return null;
+        }
+
+        entry.lastUsed = Date.now();
+        await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+        return entry;
+    });
+}
+
+async function updateJobCacheEntry(url, jobDescription, patch) {
+    if (!url || !jobDescription) return;
+    return withStorageLock(JOB_CACHE_KEY, async () => {
+        const cache = await loadJobCache();
+        const postingUrl = canonicalPostingUrl(url);
+        const key = `${postingUrl}#${await hashText(jobDescription)}`;
+        const now = Date.now();
+
+        // Expired entries start over so their results can't outlive the TTL
+        const existing = cache[key] && now - cache[key].created <= JOB_CACHE_TTL ? cache[key] : null;
+        cache[key] = {
+            ...(existing || { url: postingUrl, jobDescription, created: now }),
+            ...patch,
+            lastUsed: now
+        };
+
+        // LRU eviction
+        const keys = Object.keys(cache);
+        if (keys.length > JOB_CACHE_MAX_ENTRIES) {
+            keys.sort((a, b) => cache[a].lastUsed - cache[b].lastUsed)
+                .slice(0, keys.length - JOB_CACHE_MAX_ENTRIES)
+                .forEach(k => delete cache[k]);
+        }
+        await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+    });
+}
+
+// Results depend on the user's resume/profile too: each is stored with a hash of
+// the context it was generated from (`<field>Context`) and misses when that changes
+function getCachedResult(entry, field, contextHash) {
+    return entry?.[field] && entry[`${field}Context`] === contextHash ? entry[field] : null;
+}
+
+// Resume vs Job Description match analysis
+async function analyzeJobMatch(jobDescription, url) {
+    if (!jobDescription || jobDescription.length < 50) {
+        return { success: false, error: 'Job description too short.' };
+    }
+
+    try {
+        const data = await loadData();
+        const profile = data.profile || {};
+        const experience = data.experience || [];
+        const skills = data.skills || {};
+        let userContext = data.documents?.resume || '';
+        if (!userContext || userContext.length < 100) {
+            userContext = JSON.stringify({ profile, experience, skills }, null, 2);
+        }
+
+        const contextHash = await hashText(userContext);
+        const cached = url ? getCachedResult(await getJobCacheEntry(url, jobDescription), 'analysis', contextHash) : null;
+        if (cached) {
+            Logger.info('[JobCache] Match analysis cache hit');
+            return { success: true, data: cached, cached: true };
+        }
+
+        const MAX_CONTEXT = 3000;
+        const prompt = `Task: Compare Resume vs Job Description.
+RETURN JSON ONLY.
+
+JOB:
+${jobDescription.substring(0, MAX_CONTEXT)}
+
+RESUME:
+${userContext.substring(0, MAX_CONTEXT)}
+
+OUTPUT Format:
+{
+  "score": 0-100,
+  "summary": "1 sentence summary",
+  "missingSkills": ["skill1", "skill2"],
+  "matchingSkills": ["skill1", "skill2"]
+}`;
+
+        const result = await callAI(prompt, true);
+        if (!result) return { success: false, error: 'Analysis failed.' };
+
+        const analysis = parseJsonResponse(result);
+        if (url) await updateJobCacheEntry(url, jobDescription, { analysis, analysisContext: contextHash });
+        return { success: true, data: analysis };
+    } catch (error) {
+        Logger.error('Match analysis error', error.message);
+        return { success: false, error: error.message };
+    }
+}
+
 // Generate Cover Letter
-async function generateCoverLetter(jobDescription) {
+async function generateCoverLetter(jobDescription, url) {
     if (!jobDescription || jobDescription.length < 50) {
         return { success: false, error: 'Job description is too short to generate a cover letter.' };
     }
@@ -580,6 +984,13 @@ async function generateCoverLetter(jobDescription) {
             }, null, 2);
         }
 
+        const contextHash = await hashText(`${userName}\n${userTitle}\n${userContext}`);
+        const cached = url ? getCachedResult(await getJobCacheEntry(url, jobDescription), 'coverLetter', contextHash) : null;
+        if (cached) {
+            Logger.info('[JobCache] Cover letter cache hit');
+            return { success: true, text: cached, cached: true };
+        }
+
         const prompt = `Role: YOU ARE ${userName}, a ${userTitle}.
 Task: Write a personalized "Reach Out" message or Short Cover Letter for this job application.
 
@@ -608,7 +1019,9 @@ OUTPUT: Clean text only. No markdown.`;
             return { success: false, error: 'Failed to generate cover letter.' };
         }
 
-        return { success: true, text: result.trim() };
+        const text = result.trim();
+        if (url) await updateJobCacheEntry(url, jobDescription, { coverLetter: text, coverLetterContext: contextHash });
+        return { success: true, text };
     } catch (error) {
         Logger.error('Cover letter generation error', error.message);
         return { success: false, error: error.message };
@@ -616,6 +1029,75 @@ OUTPUT: Clean text only. No markdown.`;
 }
 
 // 8. AutoFill Logic
+// Field values come back as {value, confidence, skip} via structured output,
+// so one short generation is enough and no text cleanup is needed.
+const FIELD_MIN_CONFIDENCE = 0.3;
+// long: a ~500-word answer plus the JSON wrapper
+const FIELD_TOKEN_BUDGETS = { short: 64, long: 1024 };
+const LONG_FIELD_PATTERN = /summary|cover letter|\babout (you|yourself)\b|describe|\bwhy\b|tell us|motivation|additional information/i;
+
+function buildFieldValueSchema(field) {
+    const options = (field.options || []).filter(opt => typeof opt === 'string' && opt.trim());
+    return {
+        type: 'object',
+        properties: {
+            value: options.length > 0 ? { type: 'string', enum: options } : { type: 'string' },
+            confidence: { type: 'number', minimum: 0, maximum: 1 },
+            skip: { type: 'boolean' }
+        },
+        required: ['value', 'confidence', 'skip']
+    };
+}
+
+function getFieldTokenBudget(field) {
+    const isLong = field.type === 'textarea' || LONG_FIELD_PATTERN.test(field.label || '');
+    return isLong ? FIELD_TOKEN_BUDGETS.long : FIELD_TOKEN_BUDGETS.short;
+}
+
+// A long answer that hit the token cap ends mid-string; keep its complete sentences
+function recoverTruncatedValue(result) {
+    const match = /"value"\s*:\s*"((?:[^"\\]|\\.)*)/.exec(result || '');
+    if (!match) return null;
+    let text;
+    try {
+        // Drop a \uXXXX escape cut off by the cap
+        text = JSON.parse(`"${match[1].replace(/\\u[0-9a-fA-F]{0,3}$/, '')}"`);
+    } catch (e) {
+        return null;
+    }
+    const sentences = text.match(/^[\s\S]*[.!?](?=\s|$)/);
+    return sentences ? sentences[0].trim() : null;
+}
+
+function parseFieldValueResponse(result, field) {
+    let parsed;
+    try {
+        parsed = parseJsonResponse(result || '');
+    } catch (e) {
+        const recovered = getFieldTokenBudget(field) === FIELD_TOKEN_BUDGETS.long ? recoverTruncatedValue(result) : null;
+        if (recovered) {
+            Logger.warn(`[AutoFill] Answer for "${field.label}" hit the token cap, using complete sentences`);
+            parsed = { value: recovered };
+        } else {
+            Logger.warn(`[AutoFill] Invalid structured output for "${field.label}"`, e.message);
+            return 'SKIP';
+        }
+    }
+
+    const value = typeof parsed?.value === 'string' ? parsed.value.trim() : String(parsed?.value ?? '').trim();
+    // Providers that ignore the schema may omit confidence or return it as a string;
+    // only a parsable score below the threshold rejects the value
+    const confidence = parsed?.confidence == null ? 1 : Number(parsed.confidence);
+    if (parsed?.skip === true || !value || value.toUpperCase() === 'SKIP' || !(confidence >= FIELD_MIN_CONFIDENCE)) {
+        return 'SKIP';
+    }
+
+    const options = (field.options || []).filter(opt => typeof opt === 'string' && opt.trim());
+    if (options.length > 0 && !options.includes(value)) return 'SKIP';
+
+    return value;
+}
+
 async function processFieldWithAI(field, data) {
     // CRITICAL: Check for empty profile to avoid silent "SKIP"
     const profile = data.profile || {};
@@ -633,16 +1115,17 @@ async function processFieldWithAI(field, data) {
     const qnaContext = qna.length > 0 
         ? `\n\nPreviously Answered Questions:\n${qna.map(q => `Q: ${q.question}\nA: ${q.answer}`).join('\n\n')}`
         : '';
+    const optionsContext = field.options?.length ? `\n- Options: ${JSON.stringify(field.options)}` : '';
     
     const prompt = `Task: Fill this form field accurately using the User Profile and any relevant memories/previously answered questions.
 
 SYSTEM RULES:
-1. Return ONLY the direct value.
-2. NO explanations, NO introductory text.
+1. Respond with JSON: {"value": "<field value>", "confidence": <0-1>, "skip": <true|false>}.
+2. "value" is ONLY the direct value. NO explanations, NO introductory text.
 3. If the value is a name, return just the name. 
 4. If you find a similar question in "Previously Answered Questions" or "Relevant Memories", use that answer.
-5. If uncertain or no data exists, return "SKIP".
-6. Use plain text only.
+5. If uncertain or no data exists, set "skip" to true.
+6. If Options are listed, "value" must be one of them exactly.
 
 CRITICAL FIELD RULES:
 - If label is "Title" (or contains "Title"), it typically means **JOB TITLE**, NOT "Mr/Ms" and definitely NOT the candidate's name.
@@ -651,84 +1134,19 @@ CRITICAL FIELD RULES:
 
 Field to Fill:
 - Label: "${field.label}"
-- Type: "${field.type}"
+- Type: "${field.type}"${optionsContext}
 
 User Profile:
-${context}${qnaContext}
-
-Value:`;
-
-    let result = await callAI(prompt, false);
-
-    // Cleanup: Post-process to remove conversational filler if the AI ignores rules
-    let value = result.trim();
-
-    // Remove common AI conversational prefixes/sentences
-    const patternsToRemove = [
-        /^(Based on|Using) (the )?(provided )?(user )?profile,?\s*/i,
-        /^The (requested )?value (for .* )?is:?\s*/i,
-        /^I (will|shall) fill (in )?(this|the) (form )?field\.?\s*/i,
-        /^Since the field type is .*,?\s*/i,
-        /^I'll assume (it's|this is) asking for .*,?\s*/i,
-        /^The (first )?name (from the user profile )?is:?\s*/i,
-        /^Here's the (.*?) for the field:?\s*/i,
-        /^The extracted value is:?\s*/i,
-        /\.?\s*Return "SKIP" if uncertain/i,
-        /\.?\s*If uncertain or no data, return "SKIP"/i
-    ];
-
-    // Apply patterns multiple times to catch nested/chained sentences
-    let lastValue;
-    do {
-        lastValue = value;
-        patternsToRemove.forEach(pattern => {
-            value = value.replace(pattern, '').trim();
-        });
-    } while (value !== lastValue);
-
-    // If we still have multiple sentences on one line, try to extract the last part if it looks like a value
-    if (value.includes('.') && value.length > 30 && !field.label.toLowerCase().includes('summary')) {
-        const sentences = value.split(/\.\s+/);
-        if (sentences.length > 1) {
-            const lastPart = sentences[sentences.length - 1].trim();
-            if (lastPart.length > 0 && lastPart.length < 50 && !lastPart.includes(' ') && lastPart.toLowerCase() !== 'skip') {
-                value = lastPart;
-            } else if (lastPart.toUpperCase() === 'SKIP') {
-                value = 'SKIP';
-            }
-        }
-    }
+${context}${qnaContext}`;
 
-    // Special case: AI repeats the whole logic block - take the last line if it's a value
-    if (value.includes('\n')) {
-        const lines = value.split('\n').map(l => l.trim()).filter(l => l);
-        if (lines.some(l => l.toUpperCase() === 'SKIP')) {
-            value = 'SKIP';
-        } else {
-            let foundValue = false;
-            for (let i = lines.length - 1; i >= 0; i--) {
-                const line = lines[i];
-                if (line.length > 0 && line.length < 60 && !line.includes('assume') && !line.includes('Based on')) {
-                    value = line;
-                    foundValue = true;
-                    break;
-                }
-            }
-            if (!foundValue && lines.length > 0) {
-                value = lines[lines.length - 1];
-            }
-        }
-    }
+    const result = await callAI(prompt, true, {
+        format: buildFieldValueSchema(field),
+        numPredict: getFieldTokenBudget(field)
+    });
 
-    // Final cleanup for markdown bold/italic/quotes/brackets
-    return value.trim()
-        .replace(/^\*\*?|\*\*?$/g, '')
-        .replace(/^"|"$/g, '')
-        .replace(/^\[|\]$/g, '')
-        .replace(/^: /g, ''); // Remove leading colon
+    return parseFieldValueResponse(result, field);
 }
 
-
 // 8. Connection Handlers
 chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
 
@@ -860,7 +1278,28 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
 
     // GENERATE COVER LETTER
     if (request.action === 'generateCoverLetter') {
-        generateCoverLetter(request.jobDescription).then(sendResponse);
+        generateCoverLetter(request.jobDescription, request.url).then(sendResponse);
+        return true;
+    }
+
+    // ANALYZE JOB MATCH
+    if (request.action === 'analyzeJobMatch') {
+        analyzeJobMatch(request.jobDescription, request.url).then(sendResponse);
+        return true;
+    }
+
+    // JOB POSTING CACHE
+    if (request.action === 'getCachedJobDescription') {
+        getJobCacheEntry(request.url)
+            .then(entry => sendResponse({ success: !!entry, jobDescription: entry?.jobDescription || null }))
+            .catch(err => sendResponse({ success: false, error: err.message }));
+        return true;
+    }
+
+    if (request.action === 'cacheJobDescription') {
+        updateJobCacheEntry(request.url, request.jobDescription, {})
+            .then(() => sendResponse({ success: true }))
+            .catch(err => sendResponse({ success: false, error: err.message }));
         return true;
     }
 
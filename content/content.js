@@ -780,14 +780,14 @@
     async function handleCoverLetter() {
         showToast('📝 Reading job description...', 'info');
 
-        // Extract page text - basic implementation
-        // In a real scenario, we might want to target the main content
-        const pageText = document.body.innerText.substring(0, 15000); // Limit to ~15k chars for API
+        // Prefer the (cached) extracted JD, fall back to raw page text
+        const pageText = (await getJobDescription()) || document.body.innerText.substring(0, 15000); // Limit to ~15k chars for API
 
         try {
             const response = await chrome.runtime.sendMessage({
                 action: 'generateCoverLetter',
-                jobDescription: pageText
+                jobDescription: pageText,
+                url: location.href
             });
 
             if (response.success && response.text) {
@@ -909,6 +909,29 @@
         return null;
     }
 
+    // Cached JD lookup: in-page memo first, then a fresh DOM extraction (registered with
+    // the service worker's URL + content-hash cache). The last JD stored for this URL is
+    // only a fallback for when the page shows nothing extractable.
+    let jobDescriptionCache = null; // { url, text } - only set once a JD was found
+    async function getJobDescription() {
+        const url = location.href;
+        if (jobDescriptionCache && jobDescriptionCache.url === url) return jobDescriptionCache.text;
+
+        let text = extractJobDescription();
+        if (text) {
+            try { chrome.runtime.sendMessage({ action: 'cacheJobDescription', url, jobDescription: text }); } catch (e) { }
+            // Memoise only what the DOM gave us so late-rendering SPA pages get re-extracted
+            jobDescriptionCache = { url, text };
+            return text;
+        }
+
+        try {
+            const cached = await chrome.runtime.sendMessage({ action: 'getCachedJobDescription', url });
+            text = cached?.jobDescription || null;
+        } catch (e) { }
+        return text;
+    }
+
     // Inject Floating Match Widget (DEPRECATED - Merged into AutoFill Button)
     // Removed to consolidate UI
 
@@ -982,7 +1005,7 @@
 
         if (!silent) scoreText.innerText = 'Thinking...';
 
-        const jdText = extractJobDescription();
+        const jdText = await getJobDescription();
         if (!jdText) {
             if (!silent) scoreText.innerText = 'No JD';
             return;
@@ -991,7 +1014,8 @@
         try {
             const response = await chrome.runtime.sendMessage({
                 action: 'analyzeJobMatch',
-                jobDescription: jdText
+                jobDescription: jdText,
+                url: location.href
             });
 
             if (response.success && response.data) {
@@ -1123,9 +1147,9 @@
 
         while (autoApplyActive && attempts < maxPages) {
             // 0. Refresh Context (ensure logic has latest data)
-            const jd = extractJobDescription();
+            const jd = await getJobDescription();
             if (jd && !document.getElementById('jf-match-details')) {
-                try { chrome.runtime.sendMessage({ action: 'analyzeJobMatch', jobDescription: jd }); } catch (e) { }
+                try { chrome.runtime.sendMessage({ action: 'analyzeJobMatch', jobDescription: jd, url: location.href }); } catch (e) { }
             }
 
             // 1. Fill Form
@@ -1333,7 +1357,7 @@
 
         try {
             // Process regular fields
-            const jobDescription = extractJobDescription(); // Get current page context
+            const jobDescription = await getJobDescription(); // Get current page context (cached per posting)
 
             for (const field of fields) {
                 if (isAutofillCancelled) { break; }
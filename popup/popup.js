@@ -600,6 +600,12 @@ async function checkBrainStatus() {
                 currentData.settings.brainUrl = url;
                 chrome.storage.local.set({ settings: currentData.settings });
             }
+        } else if (response.status === 503) {
+            // Server is up but its memory (embedding model + index) is still loading
+            statusDot.className = 'status-dot disconnected';
+            statusText.textContent = 'Brain Starting...';
+            statusText.style.color = 'var(--warning)';
+            Logger.info('Brain is starting');
         } else {
             throw new Error('Not OK');
         }
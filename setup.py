@@ -11,6 +11,9 @@ Usage:
     python3 setup.py --check   # Check system requirements only
     python3 setup.py --ollama  # Setup Ollama only
     python3 setup.py --dev     # Setup development environment only
+    python3 setup.py --offline # Install npm packages from a prepared cache only
+    python3 setup.py --force   # Re-run every step, ignoring .setup-state.json
+    python3 setup.py --serve   # Run Ollama + one AI Brain worker per CPU core
 
 Requirements:
     - Python 3.8+
@@ -25,9 +28,14 @@ import platform
 import shutil
 import json
 import time
+import hashlib
+import threading
+import signal
+import socket
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Any, Callable, Dict, Optional, Tuple, List
 import urllib.request
 import urllib.error
 
@@ -39,6 +47,15 @@ OLLAMA_MODELS = ["llama3.2:3b", "llama3.2:1b"]  # Models to pull
 DEFAULT_MODEL = "llama3.2:3b"
 AI_BRAIN_PORT = 3001
 EXTENSION_DIR = Path(__file__).parent.resolve()
+AI_BRAIN_DIR = EXTENSION_DIR / "ai-brain-server"
+NPM_CACHE_DIR = EXTENSION_DIR / ".npm-cache"  # Shared by both installs; copy a prepared one here for --offline
+SETUP_STATE_FILE = EXTENSION_DIR / ".setup-state.json"  # Step checkpoints for resumable re-runs
+BRAIN_SERVER_PORT = 3000  # ai-brain-server default, matches the extension's Brain URL
+BRAIN_WORKER_PORT_BASE = 3100  # Worker i answers /health on 127.0.0.1:(base + i)
+HEALTH_CHECK_INTERVAL = 5  # seconds
+HEALTH_CHECK_FAILURES = 3  # consecutive failed checks before a worker is restarted
+WORKER_STARTUP_GRACE = 60  # seconds before a loading worker counts as unhealthy
+WRITER_STARTUP_TIMEOUT = 300  # seconds; the first start downloads MiniLM before /health is ready
 
 # Colors for terminal output
 class Colors:
@@ -105,14 +122,18 @@ def get_system_info() -> dict:
         "home_dir": Path.home(),
     }
 
-def run_command(cmd: List[str], capture: bool = True, check: bool = False) -> Tuple[int, str, str]:
-    """Run a command and return (returncode, stdout, stderr)."""
+def run_command(cmd: List[str], capture: bool = True, check: bool = False,
+                cwd: Optional[Path] = None,
+                env: Optional[Dict[str, str]] = None) -> Tuple[int, str, str]:
+    """Run a command (optionally in cwd, with extra env vars) and return (returncode, stdout, stderr)."""
     try:
         result = subprocess.run(
             cmd,
             capture_output=capture,
             text=True,
-            check=check
+            check=check,
+            cwd=cwd,
+            env={**os.environ, **env} if env else None
         )
         return result.returncode, result.stdout.strip(), result.stderr.strip()
     except FileNotFoundError:
@@ -405,59 +426,61 @@ def check_ollama_model(model: str) -> bool:
 # Project Setup Functions
 # ============================================================================
 
-def install_npm_dependencies():
-    """Install npm dependencies for the main extension."""
-    print_info("Installing extension dependencies...")
-    
-    os.chdir(EXTENSION_DIR)
-    code, stdout, stderr = run_command(["npm", "install"])
-    
+def npm_install_command(project_dir: Path, offline: bool = False,
+                        cache_dir: Path = NPM_CACHE_DIR) -> List[str]:
+    """Build the npm install command for a project directory."""
+    # npm ci installs exactly what the lockfile says and skips dependency resolution
+    has_lockfile = (project_dir / "package-lock.json").exists()
+    cmd = ["npm", "ci" if has_lockfile else "install", "--no-audit", "--no-fund", "--cache", str(cache_dir)]
+    cmd.append("--offline" if offline else "--prefer-offline")
+    return cmd
+
+def npm_install_env(offline: bool = False) -> Dict[str, str]:
+    """Extra environment for npm installs."""
+    # puppeteer's postinstall downloads Chrome, which can't work without a network;
+    # offline installs skip it (tests/e2e needs a Chrome from an online run)
+    return {"PUPPETEER_SKIP_DOWNLOAD": "1"} if offline else {}
+
+def npm_install(project_dir: Path, name: str, offline: bool = False,
+                cache_dir: Path = NPM_CACHE_DIR) -> bool:
+    """Install npm dependencies for one project, running npm in its own directory."""
+    print_info(f"Installing {name} dependencies...")
+    code, stdout, stderr = run_command(npm_install_command(project_dir, offline, cache_dir),
+                                       cwd=project_dir, env=npm_install_env(offline))
+
     if code != 0:
-        print_error(f"Failed to install dependencies: {stderr}")
+        print_error(f"Failed to install {name} dependencies: {stderr}")
         return False
-    
-    print_success("Extension dependencies installed")
+
+    print_success(f"{name} dependencies installed")
     return True
 
-def install_ai_brain_dependencies():
+def install_npm_dependencies(offline: bool = False, cache_dir: Path = NPM_CACHE_DIR):
+    """Install npm dependencies for the main extension."""
+    return npm_install(EXTENSION_DIR, "Extension", offline, cache_dir)
+
+def install_ai_brain_dependencies(offline: bool = False, cache_dir: Path = NPM_CACHE_DIR):
     """Install npm dependencies for the AI Brain server."""
-    ai_brain_dir = EXTENSION_DIR / "ai-brain-server"
-    
-    if not ai_brain_dir.exists():
+    if not AI_BRAIN_DIR.exists():
         print_warning("AI Brain server directory not found, skipping...")
         return True
-    
-    print_info("Installing AI Brain server dependencies...")
-    
-    os.chdir(ai_brain_dir)
-    code, stdout, stderr = run_command(["npm", "install"])
-    
-    if code != 0:
-        print_error(f"Failed to install AI Brain dependencies: {stderr}")
-        return False
-    
-    print_success("AI Brain server dependencies installed")
-    os.chdir(EXTENSION_DIR)
-    return True
+
+    return npm_install(AI_BRAIN_DIR, "AI Brain server", offline, cache_dir)
 
 def build_ai_brain_server():
     """Build the AI Brain TypeScript server."""
-    ai_brain_dir = EXTENSION_DIR / "ai-brain-server"
-    
-    if not ai_brain_dir.exists():
+    if not AI_BRAIN_DIR.exists():
         return True
     
     print_info("Building AI Brain server...")
     
-    os.chdir(ai_brain_dir)
-    code, stdout, stderr = run_command(["npm", "run", "build"])
+    code, stdout, stderr = run_command(["npm", "run", "build"], cwd=AI_BRAIN_DIR)
     
     if code != 0:
-        print_warning(f"Build step skipped (may not be configured): {stderr}")
-    else:
-        print_success("AI Brain server built successfully")
+        print_error(f"AI Brain server build failed: {stderr or stdout}")
+        return False
     
-    os.chdir(EXTENSION_DIR)
+    print_success("AI Brain server built successfully")
     return True
 
 def create_default_profile():
@@ -548,8 +571,7 @@ def run_tests():
     """Run the test suite."""
     print_info("Running tests to verify setup...")
     
-    os.chdir(EXTENSION_DIR)
-    code, stdout, stderr = run_command(["npm", "test"])
+    code, stdout, stderr = run_command(["npm", "test"], cwd=EXTENSION_DIR)
     
     if code != 0:
         print_warning("Some tests may have failed (this is OK for initial setup)")
@@ -558,6 +580,288 @@ def run_tests():
     
     return True
 
+# ============================================================================
+# AI Brain Server Supervisor
+# ============================================================================
+
+class BrainSupervisor:
+    """Runs Ollama and N AI Brain workers behind one shared listening socket.
+
+    The supervisor binds the public port once and passes the socket to every
+    worker, so the kernel spreads connections across cores. Worker 0 is the
+    only memory writer; the others forward writes to it and reload the
+    shared on-disk vector index when it changes.
+    """
+
+    def __init__(self, workers: int, port: int = BRAIN_SERVER_PORT):
+        self.port = port
+        self.shared_socket = platform.system() != "Windows"  # fd passing needs POSIX
+        self.workers = workers if self.shared_socket else 1
+        self.processes: Dict[int, subprocess.Popen] = {}
+        self.started: Dict[int, float] = {}
+        self.failures: Dict[int, int] = {}
+        self.restarts = 0
+        self.ollama: Optional[subprocess.Popen] = None
+        self.socket: Optional[socket.socket] = None
+        self.stopping = False
+
+    def start_ollama(self) -> bool:
+        """Start Ollama unless it is already running; only an Ollama we started is stopped later."""
+        if check_ollama_running():
+            print_success("Ollama is already running")
+            return True
+        if not check_command_exists("ollama"):
+            print_warning("Ollama not installed, chat requests will fail")
+            return False
+
+        print_info("Starting Ollama server...")
+        self.ollama = subprocess.Popen(["ollama", "serve"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        for _ in range(10):
+            time.sleep(1)
+            if check_ollama_running():
+                print_success("Ollama server started")
+                return True
+        print_error("Failed to start Ollama server")
+        return False
+
+    def worker_port(self, index: int) -> int:
+        return BRAIN_WORKER_PORT_BASE + index
+
+    def start_worker(self, index: int):
+        """Spawn (or respawn) one Brain worker."""
+        env = {**os.environ, "BRAIN_WORKER_ID": str(index), "BRAIN_WORKER_PORT": str(self.worker_port(index))}
+        pass_fds = ()
+        if self.socket:
+            env["BRAIN_LISTEN_FD"] = str(self.socket.fileno())
+            pass_fds = (self.socket.fileno(),)
+        else:
+            env["PORT"] = str(self.port)
+        if index > 0:
+            env["BRAIN_MEMORY_WRITER_URL"] = f"http://127.0.0.1:{self.worker_port(0)}"
+
+        self.processes[index] = subprocess.Popen(
+            ["node", "dist/index.js"], cwd=AI_BRAIN_DIR, env=env, pass_fds=pass_fds
+        )
+        self.started[index] = time.monotonic()
+        self.failures[index] = 0
+        print_info(f"Worker {index} started (pid {self.processes[index].pid})")
+
+    def worker_healthy(self, index: int) -> bool:
+        """True once the worker answers /health with 200 (503 while its memory loads)."""
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{self.worker_port(index)}/health", timeout=2)
+            return True
+        except (urllib.error.URLError, OSError):
+            return False
+
+    def wait_healthy(self, index: int, timeout: float = WORKER_STARTUP_GRACE) -> bool:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline and not self.stopping:
+            if self.worker_healthy(index):
+                return True
+            if self.processes[index].poll() is not None:
+                return False
+            time.sleep(1)
+        return False
+
+    def stop_worker(self, index: int):
+        process = self.processes.get(index)
+        if not process or process.poll() is not None:
+            return
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def check_workers(self):
+        """Restart workers that exited or stopped answering /health."""
+        for index, process in list(self.processes.items()):
+            if self.stopping:
+                return
+            code = process.poll()
+            if code is None:
+                if time.monotonic() - self.started[index] < WORKER_STARTUP_GRACE:
+                    continue
+                if self.worker_healthy(index):
+                    self.failures[index] = 0
+                    continue
+                self.failures[index] += 1
+                if self.failures[index] < HEALTH_CHECK_FAILURES:
+                    continue
+                print_warning(f"Worker {index} failed {HEALTH_CHECK_FAILURES} health checks, restarting")
+                self.stop_worker(index)
+            else:
+                print_warning(f"Worker {index} exited with code {code}, restarting")
+            self.restarts += 1
+            self.start_worker(index)
+
+    def shutdown(self):
+        """Stop all workers, then Ollama if the supervisor started it."""
+        self.stopping = True
+        print_info("Shutting down AI Brain workers...")
+        for process in self.processes.values():
+            if process.poll() is None:
+                process.terminate()
+        for index in self.processes:
+            self.stop_worker(index)
+        if self.socket:
+            self.socket.close()
+        if self.ollama and self.ollama.poll() is None:
+            print_info("Stopping Ollama server...")
+            self.ollama.terminate()
+            try:
+                self.ollama.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.ollama.kill()
+        print_success(f"Stopped ({self.restarts} worker restarts)")
+
+    def run(self) -> bool:
+        """Start everything and supervise until interrupted."""
+        if not (AI_BRAIN_DIR / "dist" / "index.js").exists():
+            print_error("AI Brain server is not built. Run: python3 setup.py --dev")
+            return False
+
+        def request_stop(signum, frame):
+            self.stopping = True
+        signal.signal(signal.SIGTERM, request_stop)
+
+        self.start_ollama()
+
+        if self.shared_socket:
+            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.socket.bind(("", self.port))
+            self.socket.listen(511)
+            self.socket.set_inheritable(True)
+
+        try:
+            # Writer first: readers start only once it reports ready, so the model
+            # is downloaded and the shared index created exactly once
+            self.start_worker(0)
+            print_info("Waiting for worker 0 to load memory...")
+            if not self.wait_healthy(0, WRITER_STARTUP_TIMEOUT):
+                print_error("Worker 0 did not become healthy")
+                return False
+            for index in range(1, self.workers):
+                self.start_worker(index)
+
+            print_success(f"AI Brain serving on http://localhost:{self.port} with {self.workers} worker(s)")
+            print_info("Press Ctrl+C to stop")
+            while not self.stopping:
+                time.sleep(HEALTH_CHECK_INTERVAL)
+                self.check_workers()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.shutdown()
+        return True
+
+# ============================================================================
+# Setup State (Checkpoints)
+# ============================================================================
+
+def hash_inputs(paths: List[Path] = (), values: Any = None) -> str:
+    """Hash file/directory contents plus arbitrary JSON-able values."""
+    digest = hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode())
+    for path in paths:
+        files = sorted(p for p in path.rglob("*") if p.is_file()) if path.is_dir() else [path]
+        for file in files:
+            digest.update(str(file.relative_to(EXTENSION_DIR)).encode())
+            digest.update(file.read_bytes() if file.exists() else b"<missing>")
+    return digest.hexdigest()
+
+class SetupState:
+    """Records each step's input hash, output and status in SETUP_STATE_FILE.
+
+    A step whose inputs (and upstream steps' inputs) are unchanged since its
+    last successful run is skipped, so a failed run resumes at the step that
+    failed. Timings for this run (and its wall-clock start) are kept for
+    the summary.
+    """
+
+    def __init__(self, path: Path = SETUP_STATE_FILE, force: bool = False):
+        self.path = path
+        self.started = time.monotonic()
+        self.steps: Dict[str, dict] = {}
+        self.timings: List[Tuple[str, str, float]] = []
+        self.failed: set = set()
+        self._lock = threading.Lock()
+
+        if path.exists() and not force:
+            try:
+                self.steps = json.loads(path.read_text()).get("steps", {})
+            except (OSError, ValueError):
+                print_warning(f"Ignoring unreadable setup state: {path.name}")
+
+    def save(self):
+        """Write the step records to disk."""
+        with self._lock:
+            self.path.write_text(json.dumps({"steps": self.steps}, indent=2, default=str))
+
+    def run(self, name: str, inputs: Optional[str], func: Callable[[], Any],
+            after: List[str] = (), outputs: List[Path] = ()) -> Any:
+        """Run a step unless its inputs are unchanged; return the step output.
+
+        inputs=None runs the step every time (it is still timed). A step with
+        unchanged inputs is only skipped while all of its `outputs` exist.
+        A step fails when func returns False or raises. Steps listed in
+        `after` that failed in this run cause this step to be skipped.
+        """
+        if any(dep in self.failed for dep in after):
+            print_warning(f"Skipping {name}: depends on a failed step")
+            self.failed.add(name)
+            self.timings.append((name, "blocked", 0.0))
+            return None
+
+        skippable = inputs is not None
+        upstream = [self.steps.get(dep, {}).get("inputs") for dep in after]
+        inputs = hashlib.sha256(json.dumps([inputs, upstream]).encode()).hexdigest()
+        previous = self.steps.get(name)
+        if (skippable and previous and previous.get("status") == "ok"
+                and previous.get("inputs") == inputs and all(p.exists() for p in outputs)):
+            print_success(f"{name}: unchanged since last run, skipped")
+            self.timings.append((name, "skipped", 0.0))
+            return previous.get("output")
+
+        start = time.monotonic()
+        status, output = "failed", None
+        try:
+            output = func()
+            status = "failed" if output is False else "ok"
+            return output
+        finally:
+            duration = time.monotonic() - start
+            with self._lock:
+                self.steps[name] = {
+                    "inputs": inputs,
+                    "status": status,
+                    "output": output,
+                    "duration": round(duration, 2),
+                    "finished": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                }
+                self.timings.append((name, "ran" if status == "ok" else "failed", duration))
+                if status != "ok":
+                    self.failed.add(name)
+            self.save()
+
+def print_timing_summary(state: SetupState):
+    """Print where setup time went in this run."""
+    if not state.timings:
+        return
+    # Steps can overlap (the npm installs run in parallel), so the sum of step
+    # times is reported separately from the run's wall-clock time
+    step_total = sum(duration for _, _, duration in state.timings)
+    wall = time.monotonic() - state.started
+    print(f"\n  {colored('Setup Timing:', Colors.BOLD)}")
+    for name, status, duration in state.timings:
+        print(f"    {name:<24} {status:<8} {duration:7.1f}s")
+    print(f"    {'sum of steps':<24} {'':<8} {step_total:7.1f}s")
+    print(f"    {'wall time':<24} {'':<8} {wall:7.1f}s")
+    if state.failed:
+        print_info("Re-run setup.py to resume from the failed step(s)")
+
 # ============================================================================
 # Main Setup Flow
 # ============================================================================
@@ -639,7 +943,19 @@ def setup_dependencies(requirements: dict):
     else:
         print_success("Ollama already installed")
 
-def setup_ollama(requirements: dict):
+def pull_missing_models() -> bool:
+    """Pull any configured Ollama models that are not installed yet."""
+    all_ok = True
+    for model in OLLAMA_MODELS:
+        if check_ollama_model(model):
+            print_success(f"Model {model} already available")
+        else:
+            if not pull_ollama_model(model):
+                print_warning(f"Failed to pull {model}, continuing...")
+                all_ok = False
+    return all_ok
+
+def setup_ollama(requirements: dict, state: SetupState):
     """Setup Ollama server and models."""
     print_step(3, 6, "Setting Up Ollama")
     
@@ -651,20 +967,40 @@ def setup_ollama(requirements: dict):
             sys.exit(1)
     
     # Pull required models
-    for model in OLLAMA_MODELS:
-        if check_ollama_model(model):
-            print_success(f"Model {model} already available")
-        else:
-            if not pull_ollama_model(model):
-                print_warning(f"Failed to pull {model}, continuing...")
+    state.run("models", hash_inputs(values=OLLAMA_MODELS), pull_missing_models, after=["dependencies"])
 
-def setup_project():
+def npm_step_inputs(project_dir: Path) -> str:
+    """Input hash for an npm install: manifest and lockfile."""
+    return hash_inputs([project_dir / "package.json", project_dir / "package-lock.json"])
+
+def setup_project(state: SetupState, offline: bool = False, cache_dir: Path = NPM_CACHE_DIR):
     """Setup the project dependencies and configuration."""
     print_step(4, 6, "Setting Up Project")
     
-    install_npm_dependencies()
-    install_ai_brain_dependencies()
-    build_ai_brain_server()
+    if offline and not cache_dir.exists():
+        print_error(f"Offline install needs a prepared npm cache at {cache_dir}")
+        print_info("Populate it with an online run first: python3 setup.py --dev --npm-cache <dir>")
+        sys.exit(1)
+    
+    # The extension and the AI Brain server are independent npm trees,
+    # so install them side by side; the build only needs the Brain's deps.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        extension = pool.submit(
+            state.run, "extension_dependencies", npm_step_inputs(EXTENSION_DIR),
+            lambda: install_npm_dependencies(offline, cache_dir),
+            outputs=[EXTENSION_DIR / "node_modules"]
+        )
+        ai_brain = pool.submit(
+            state.run, "ai_brain_dependencies", npm_step_inputs(AI_BRAIN_DIR),
+            lambda: install_ai_brain_dependencies(offline, cache_dir),
+            outputs=[AI_BRAIN_DIR / "node_modules"]
+        )
+        extension.result()
+        ai_brain.result()
+    
+    build_inputs = hash_inputs([AI_BRAIN_DIR / "src", AI_BRAIN_DIR / "tsconfig.json"])
+    state.run("ai_brain_build", build_inputs, build_ai_brain_server, after=["ai_brain_dependencies"],
+              outputs=[AI_BRAIN_DIR / "dist" / "index.js"])
 
 def setup_configuration():
     """Create configuration files."""
@@ -696,7 +1032,7 @@ def print_completion():
      • Select this folder: {EXTENSION_DIR}
 
   3. {colored('Start the AI Brain server (optional):', Colors.CYAN)}
-     cd ai-brain-server && npm start
+     python3 setup.py --serve   (one worker per CPU core)
 
   4. {colored('Test the extension:', Colors.CYAN)}
      • Click the extension icon in Chrome
@@ -708,7 +1044,7 @@ def print_completion():
   {colored('Useful Commands:', Colors.BOLD)}
 
   • Run tests:        npm test
-  • Start AI Brain:   cd ai-brain-server && npm start
+  • Start AI Brain:   python3 setup.py --serve
   • Pull more models: ollama pull <model-name>
   • Check Ollama:     ollama list
 
@@ -752,22 +1088,56 @@ def main():
         action="store_true",
         help="Skip downloading Ollama models"
     )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Install npm dependencies from the local cache only (no network)"
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run Ollama and supervised AI Brain workers (Ctrl+C to stop)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of AI Brain workers for --serve (default: CPU cores)"
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=BRAIN_SERVER_PORT,
+        help=f"Public AI Brain port for --serve (default: {BRAIN_SERVER_PORT})"
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Ignore saved setup state and re-run every step"
+    )
+    parser.add_argument(
+        "--npm-cache",
+        type=Path,
+        default=NPM_CACHE_DIR,
+        help=f"npm cache directory shared by all installs (default: {NPM_CACHE_DIR})"
+    )
     
     args = parser.parse_args()
     
     print_banner()
     
+    if args.serve:
+        sys.exit(0 if BrainSupervisor(max(1, args.workers), args.port).run() else 1)
+    
     # Get system info
     sys_info = get_system_info()
     print(f"  System: {sys_info['os']} {sys_info['architecture']}")
     print(f"  Python: {sys_info['python_version']}")
     print(f"  Directory: {EXTENSION_DIR}")
     
-    # Check requirements
-    requirements = check_requirements()
-    
     if args.check:
-        # Just check and exit
+        # Just check and exit (always live, never from saved state)
+        requirements = check_requirements()
         all_ok = all([
             requirements["node"][0],
             requirements["npm"][0],
@@ -776,34 +1146,42 @@ def main():
         ])
         sys.exit(0 if all_ok else 1)
     
+    # Check requirements (always live: versions can change without the paths changing)
+    state = SetupState(force=args.force)
+    requirements = state.run("requirements", None, check_requirements)
+    requirements["ollama_running"] = check_ollama_running()
+    
     if args.ollama:
         # Only setup Ollama
-        setup_dependencies(requirements)
-        setup_ollama(requirements)
+        state.run("dependencies", None, lambda: setup_dependencies(requirements), after=["requirements"])
+        setup_ollama(requirements, state)
+        print_timing_summary(state)
         print_success("Ollama setup complete!")
         sys.exit(0)
     
     if args.dev:
         # Only setup development environment
-        setup_project()
+        setup_project(state, args.offline, args.npm_cache.resolve())
         setup_configuration()
+        print_timing_summary(state)
         print_success("Development environment setup complete!")
         sys.exit(0)
     
     # Full setup
-    setup_dependencies(requirements)
+    state.run("dependencies", None, lambda: setup_dependencies(requirements), after=["requirements"])
     
     if not args.skip_models:
         # Re-check ollama after potential installation
         requirements["ollama"] = check_ollama()
         requirements["ollama_running"] = check_ollama_running()
-        setup_ollama(requirements)
+        setup_ollama(requirements, state)
     else:
         print_info("Skipping Ollama model downloads (--skip-models)")
     
-    setup_project()
+    setup_project(state, args.offline, args.npm_cache.resolve())
     setup_configuration()
     print_completion()
+    print_timing_summary(state)
 
 if __name__ == "__main__":
     try:
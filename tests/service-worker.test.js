@@ -17,7 +17,8 @@ const mockStorage = {
                 (typeof keys === 'string' ? { [keys]: mockStorage.data[keys] } : 
                 keys.reduce((acc, key) => ({ ...acc, [key]: mockStorage.data[key] }), {}));
             if (callback) callback(result);
-            return Promise.resolve(result);
+            // Real storage resolves asynchronously with copies of the stored values
+            return new Promise(resolve => setTimeout(() => resolve(JSON.parse(JSON.stringify(result))), 0));
         }),
         set: jest.fn((data, callback) => {
             Object.assign(mockStorage.data, data);
@@ -158,6 +159,263 @@ function normalizeResumeData(data) {
     return normalized;
 }
 
+const RESUME_SECTION_HEADINGS = {
+    contact: /^(contact( information| details)?|personal (information|details)|(professional )?summary|profile|about( me)?|objective)$/,
+    experience: /^((work|professional|employment|relevant) )?(experience|history)$|^employment( history)?$|^career history$/,
+    education: /^(education( and training)?|academic (background|qualifications)|qualifications)$/,
+    skills: /^((technical|core|key) )?(skills|competencies)( and (tools|technologies))?$|^technologies$|^tools$/
+};
+
+function detectResumeHeading(line) {
+    const heading = line.replace(/[^a-zA-Z& ]/g, '').replace(/&/g, 'and').replace(/\s+/g, ' ').trim().toLowerCase();
+    if (!heading || heading.length > 40) return null;
+    for (const [section, pattern] of Object.entries(RESUME_SECTION_HEADINGS)) {
+        if (pattern.test(heading)) return section;
+    }
+    return null;
+}
+
+function splitResumeSections(text) {
+    const sections = {};
+    let current = 'contact';
+    for (const line of (text || '').split(/\r?\n/)) {
+        const heading = detectResumeHeading(line);
+        if (heading) {
+            current = heading;
+            continue;
+        }
+        sections[current] = sections[current] ? `${sections[current]}\n${line}` : line;
+    }
+    for (const key of Object.keys(sections)) {
+        sections[key] = sections[key].trim();
+        if (!sections[key]) delete sections[key];
+    }
+    return sections;
+}
+
+async function runWithConcurrency(items, limit, worker) {
+    const results = new Array(items.length);
+    let next = 0;
+    const runners = Array.from({ length: Math.min(limit, items.length) }, async () => {
+        while (next < items.length) {
+            const index = next++;
+            results[index] = await worker(items[index], index);
+        }
+    });
+    await Promise.all(runners);
+    return results;
+}
+
+function mergeResumeSections(parts) {
+    const merged = {
+        profile: { personal: {}, address: {}, summary: '' },
+        experience: [],
+        education: [],
+        skills: { technical: [], languages: [], soft: [] }
+    };
+
+    for (const part of parts) {
+        if (!part) continue;
+        if (part.profile) {
+            Object.assign(merged.profile.personal, part.profile.personal || {});
+            if (part.profile.address && typeof part.profile.address === 'object') {
+                Object.assign(merged.profile.address, part.profile.address);
+            }
+            merged.profile.summary = merged.profile.summary || part.profile.summary || '';
+        }
+        for (const key of ['experience', 'education']) {
+            if (!part[key]) continue;
+            merged[key].push(...(Array.isArray(part[key]) ? part[key] : [part[key]]));
+        }
+        if (part.skills) {
+            for (const key of Object.keys(merged.skills)) {
+                const value = part.skills[key];
+                if (value) merged.skills[key].push(...(Array.isArray(value) ? value : [value]));
+            }
+        }
+    }
+    return merged;
+}
+
+function parseJsonResponse(result) {
+    let jsonStr = result.trim();
+    if (jsonStr.startsWith('```')) jsonStr = jsonStr.replace(/^```json?\n?/, '').replace(/\n?```$/, '');
+    const firstCurly = jsonStr.indexOf('{');
+    const lastCurly = jsonStr.lastIndexOf('}');
+    if (firstCurly !== -1 && lastCurly !== -1) jsonStr = jsonStr.substring(firstCurly, lastCurly + 1);
+    return JSON.parse(jsonStr);
+}
+
+const FIELD_MIN_CONFIDENCE = 0.3;
+const FIELD_TOKEN_BUDGETS = { short: 64, long: 1024 };
+const LONG_FIELD_PATTERN = /summary|cover letter|\babout (you|yourself)\b|describe|\bwhy\b|tell us|motivation|additional information/i;
+
+function buildFieldValueSchema(field) {
+    const options = (field.options || []).filter(opt => typeof opt === 'string' && opt.trim());
+    return {
+        type: 'object',
+        properties: {
+            value: options.length > 0 ? { type: 'string', enum: options } : { type: 'string' },
+            confidence: { type: 'number', minimum: 0, maximum: 1 },
+            skip: { type: 'boolean' }
+        },
+        required: ['value', 'confidence', 'skip']
+    };
+}
+
+function getFieldTokenBudget(field) {
+    const isLong = field.type === 'textarea' || LONG_FIELD_PATTERN.test(field.label || '');
+    return isLong ? FIELD_TOKEN_BUDGETS.long : FIELD_TOKEN_BUDGETS.short;
+}
+
+function recoverTruncatedValue(result) {
+    const match = /"value"\s*:\s*"((?:[^"\\]|\\.)*)/.exec(result || '');
+    if (!match) return null;
+    let text;
+    try {
+        text = JSON.parse(`"${match[1].replace(/\\u[0-9a-fA-F]{0,3}$/, '')}"`);
+    } catch (e) {
+        return null;
+    }
+    const sentences = text.match(/^[\s\S]*[.!?](?=\s|$)/);
+    return sentences ? sentences[0].trim() : null;
+}
+
+function parseFieldValueResponse(result, field) {
+    let parsed;
+    try {
+        parsed = parseJsonResponse(result || '');
+    } catch (e) {
+        const recovered = getFieldTokenBudget(field) === FIELD_TOKEN_BUDGETS.long ? recoverTruncatedValue(result) : null;
+        if (!recovered) return 'SKIP';
+        parsed = { value: recovered };
+    }
+
+    const value = typeof parsed?.value === 'string' ? parsed.value.trim() : String(parsed?.value ?? '').trim();
+    const confidence = parsed?.confidence == null ? 1 : Number(parsed.confidence);
+    if (parsed?.skip === true || !value || value.toUpperCase() === 'SKIP' || !(confidence >= FIELD_MIN_CONFIDENCE)) {
+        return 'SKIP';
+    }
+
+    const options = (field.options || []).filter(opt => typeof opt === 'string' && opt.trim());
+    if (options.length > 0 && !options.includes(value)) return 'SKIP';
+
+    return value;
+}
+
+const JOB_CACHE_KEY = 'jobPostingCache';
+const JOB_CACHE_MAX_ENTRIES = 50;
+const JOB_CACHE_TTL = 7 * 24 * 3600000;
+const TRACKING_PARAMS = /^(utm_.*|gclid|fbclid|msclkid|ref|referrer|src|source|trk|trackingid|refid|gh_src|lever-source)$/i;
+
+function canonicalPostingUrl(url) {
+    try {
+        const parsed = new URL(url);
+        const params = [...parsed.searchParams.entries()]
+            .filter(([key]) => !TRACKING_PARAMS.test(key))
+            .sort(([a], [b]) => a.localeCompare(b));
+        const query = params.length > 0 ? `?${new URLSearchParams(params).toString()}` : '';
+        const path = parsed.pathname.replace(/\/+$/, '') || '/';
+        return `${parsed.protocol}//${parsed.host.toLowerCase()}${path}${query}`;
+    } catch (e) {
+        return url || '';
+    }
+}
+
+async function hashText(text) {
+    const normalized = (text || '').replace(/\s+/g, ' ').trim();
+    const digest = await crypto.subtle.digest('SHA-256', new TextEncoder().encode(normalized));
+    return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('').substring(0, 16);
+}
+
+const storageQueues = {};
+function withStorageLock(key, task) {
+    const run = (storageQueues[key] || Promise.resolve()).then(task);
+    storageQueues[key] = run.catch(() => { });
+    return run;
+}
+
+const RESUME_MEMORY_KEY = 'brainResumeSections';
+const storeBrainMemory = jest.fn(async () => true);
+
+async function storeResumeSectionMemory(section, text, brainUrl) {
+    const contentHash = await hashText(text);
+    const result = await chrome.storage.local.get(RESUME_MEMORY_KEY);
+    const stored = result[RESUME_MEMORY_KEY] || {};
+    if ((stored[section] || []).includes(contentHash)) return;
+
+    const ok = await storeBrainMemory(`Resume ${section}:\n${text}`, { type: 'resume_section', section, contentHash }, brainUrl);
+    if (!ok) return;
+
+    await withStorageLock(RESUME_MEMORY_KEY, async () => {
+        const latest = (await chrome.storage.local.get(RESUME_MEMORY_KEY))[RESUME_MEMORY_KEY] || {};
+        latest[section] = [...(latest[section] || []), contentHash];
+        await chrome.storage.local.set({ [RESUME_MEMORY_KEY]: latest });
+    });
+}
+
+async function loadJobCache() {
+    const result = await chrome.storage.local.get(JOB_CACHE_KEY);
+    return result[JOB_CACHE_KEY] || {};
+}
+
+async function getJobCacheEntry(url, jobDescription) {
+    return withStorageLock(JOB_CACHE_KEY, async () => {
+        const cache = await loadJobCache();
+        const postingUrl = canonicalPostingUrl(url);
+        let key = null;
+
+        if (jobDescription) {
+            key = `${postingUrl}#${await hashText(jobDescription)}`;
+        } else {
+            const candidates = Object.keys(cache).filter(k => cache[k].url === postingUrl);
+            candidates.sort((a, b) => cache[b].lastUsed - cache[a].lastUsed);
+            key = candidates[0] || null;
+        }
+
+        const entry = key ? cache[key] : null;
+        if (!entry) return null;
+        if (Date.now() - entry.created > JOB_CACHE_TTL) {
+            delete cache[key];
+            await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+            return null;
+        }
+
+        entry.lastUsed = Date.now();
+        await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+        return entry;
+    });
+}
+
+async function updateJobCacheEntry(url, jobDescription, patch) {
+    if (!url || !jobDescription) return;
+    return withStorageLock(JOB_CACHE_KEY, async () => {
+        const cache = await loadJobCache();
+        const postingUrl = canonicalPostingUrl(url);
+        const key = `${postingUrl}#${await hashText(jobDescription)}`;
+        const now = Date.now();
+
+        const existing = cache[key] && now - cache[key].created <= JOB_CACHE_TTL ? cache[key] : null;
+        cache[key] = {
+            ...(existing || { url: postingUrl, jobDescription, created: now }),
+            ...patch,
+            lastUsed: now
+        };
+
+        const keys = Object.keys(cache);
+        if (keys.length > JOB_CACHE_MAX_ENTRIES) {
+            keys.sort((a, b) => cache[a].lastUsed - cache[b].lastUsed)
+                .slice(0, keys.length - JOB_CACHE_MAX_ENTRIES)
+                .forEach(k => delete cache[k]);
+        }
+        await chrome.storage.local.set({ [JOB_CACHE_KEY]: cache });
+    });
+}
+
+function getCachedResult(entry, field, contextHash) {
+    return entry?.[field] && entry[`${field}Context`] === contextHash ? entry[field] : null;
+}
+
 // ============================================
 // TEST SUITES
 // ============================================
@@ -268,6 +526,331 @@ describe('Service Worker - Utility Functions', () => {
     });
 });
 
+describe('Service Worker - Chunked Resume Parsing', () => {
+
+    describe('splitResumeSections()', () => {
+        test('should split a resume on common headings', () => {
+            const text = 'John Doe\njohn@example.com\n\nWORK EXPERIENCE:\nAcme Corp - Developer\n\nEducation\nMIT, BSc\n\nSkills & Tools\nJavaScript, Go';
+            const sections = splitResumeSections(text);
+            expect(sections.contact).toBe('John Doe\njohn@example.com');
+            expect(sections.experience).toBe('Acme Corp - Developer');
+            expect(sections.education).toBe('MIT, BSc');
+            expect(sections.skills).toBe('JavaScript, Go');
+        });
+
+        test('should keep unrecognised headings with the current section', () => {
+            const sections = splitResumeSections('Experience\nAcme\nProjects\nSide project');
+            expect(sections.experience).toBe('Acme\nProjects\nSide project');
+        });
+
+        test('should drop empty sections', () => {
+            const sections = splitResumeSections('Skills\n\nEducation\nMIT');
+            expect(sections).not.toHaveProperty('skills');
+            expect(sections.education).toBe('MIT');
+        });
+
+        test('should treat headingless text as contact only', () => {
+            expect(Object.keys(splitResumeSections('Jane Smith\njane@example.com'))).toEqual(['contact']);
+        });
+    });
+
+    describe('runWithConcurrency()', () => {
+        test('should preserve input order in results', async () => {
+            const results = await runWithConcurrency([3, 1, 2], 2, async (n) => {
+                await new Promise(resolve => setTimeout(resolve, n * 5));
+                return n * 10;
+            });
+            expect(results).toEqual([30, 10, 20]);
+        });
+
+        test('should never exceed the concurrency limit', async () => {
+            let active = 0;
+            let peak = 0;
+            await runWithConcurrency([1, 2, 3, 4, 5], 2, async () => {
+                active++;
+                peak = Math.max(peak, active);
+                await new Promise(resolve => setTimeout(resolve, 5));
+                active--;
+            });
+            expect(peak).toBe(2);
+        });
+    });
+
+    describe('mergeResumeSections()', () => {
+        test('should merge section results into one resume', () => {
+            const merged = mergeResumeSections([
+                { profile: { personal: { firstName: 'John', lastName: 'Doe' }, summary: 'Engineer' } },
+                { experience: [{ company: 'Acme' }] },
+                { education: { institution: 'MIT' } },
+                { skills: { technical: ['JavaScript'], soft: 'Leadership' } }
+            ]);
+            expect(merged.profile.personal.firstName).toBe('John');
+            expect(merged.profile.summary).toBe('Engineer');
+            expect(merged.experience).toEqual([{ company: 'Acme' }]);
+            expect(merged.education).toEqual([{ institution: 'MIT' }]);
+            expect(merged.skills.technical).toEqual(['JavaScript']);
+            expect(merged.skills.soft).toEqual(['Leadership']);
+        });
+
+        test('should skip failed sections', () => {
+            const merged = mergeResumeSections([null, { experience: [{ company: 'Acme' }] }]);
+            expect(merged.experience).toHaveLength(1);
+            expect(merged.education).toEqual([]);
+        });
+    });
+
+    describe('storeResumeSectionMemory()', () => {
+        beforeEach(() => {
+            mockStorage.data = {};
+            storeBrainMemory.mockClear();
+            storeBrainMemory.mockResolvedValue(true);
+        });
+
+        test('should not store the same section twice on re-import', async () => {
+            await storeResumeSectionMemory('experience', 'Acme Corp 2020-2023', 'http://localhost:3000');
+            await storeResumeSectionMemory('experience', 'Acme  Corp\n2020-2023', 'http://localhost:3000');
+            expect(storeBrainMemory).toHaveBeenCalledTimes(1);
+        });
+
+        test('should store changed section content', async () => {
+            await storeResumeSectionMemory('experience', 'Acme Corp 2020-2023', 'http://localhost:3000');
+            await storeResumeSectionMemory('experience', 'Globex 2023-present', 'http://localhost:3000');
+            expect(storeBrainMemory).toHaveBeenCalledTimes(2);
+        });
+
+        test('should record every section when stores run concurrently', async () => {
+            await Promise.all([
+                storeResumeSectionMemory('contact', 'john@example.com', 'http://localhost:3000'),
+                storeResumeSectionMemory('experience', 'Acme Corp 2020-2023', 'http://localhost:3000')
+            ]);
+            expect(Object.keys(mockStorage.data[RESUME_MEMORY_KEY]).sort()).toEqual(['contact', 'experience']);
+
+            await storeResumeSectionMemory('contact', 'john@example.com', 'http://localhost:3000');
+            expect(storeBrainMemory).toHaveBeenCalledTimes(2);
+        });
+
+        test('should retry a section whose store failed', async () => {
+            storeBrainMemory.mockResolvedValueOnce(false);
+            await storeResumeSectionMemory('skills', 'JavaScript, Python', 'http://localhost:3000');
+            await storeResumeSectionMemory('skills', 'JavaScript, Python', 'http://localhost:3000');
+            expect(storeBrainMemory).toHaveBeenCalledTimes(2);
+        });
+    });
+});
+
+describe('Service Worker - Structured Field Values', () => {
+
+    describe('buildFieldValueSchema()', () => {
+        test('should require value, confidence and skip', () => {
+            const schema = buildFieldValueSchema({ label: 'First Name', type: 'text' });
+            expect(schema.required).toEqual(['value', 'confidence', 'skip']);
+            expect(schema.properties.value).toEqual({ type: 'string' });
+        });
+
+        test('should constrain select fields to their options', () => {
+            const schema = buildFieldValueSchema({ label: 'Country', type: 'select', options: ['India', 'USA', ''] });
+            expect(schema.properties.value.enum).toEqual(['India', 'USA']);
+        });
+    });
+
+    describe('getFieldTokenBudget()', () => {
+        test('should use a short budget for simple fields', () => {
+            expect(getFieldTokenBudget({ label: 'Email', type: 'email' })).toBe(64);
+        });
+
+        test('should use a long budget for textareas and essay questions', () => {
+            expect(getFieldTokenBudget({ label: 'Comments', type: 'textarea' })).toBe(1024);
+            expect(getFieldTokenBudget({ label: 'Why do you want to join us?', type: 'text' })).toBe(1024);
+            expect(getFieldTokenBudget({ label: 'Tell us about yourself', type: 'text' })).toBe(1024);
+        });
+
+        test('should not treat short questions mentioning "about" as essays', () => {
+            expect(getFieldTokenBudget({ label: 'How did you hear about us?', type: 'select' })).toBe(64);
+        });
+    });
+
+    describe('parseFieldValueResponse()', () => {
+        const field = { label: 'First Name', type: 'text' };
+
+        test('should return the value from valid output', () => {
+            expect(parseFieldValueResponse('{"value": " Akash ", "confidence": 0.9, "skip": false}', field)).toBe('Akash');
+        });
+
+        test('should skip when the model sets skip', () => {
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": 0.9, "skip": true}', field)).toBe('SKIP');
+        });
+
+        test('should skip low-confidence values', () => {
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": 0.1, "skip": false}', field)).toBe('SKIP');
+        });
+
+        test('should accept values when confidence is missing', () => {
+            expect(parseFieldValueResponse('{"value": "Akash"}', field)).toBe('Akash');
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": null, "skip": false}', field)).toBe('Akash');
+        });
+
+        test('should coerce string confidence', () => {
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": "0.8"}', field)).toBe('Akash');
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": "0.1"}', field)).toBe('SKIP');
+            expect(parseFieldValueResponse('{"value": "Akash", "confidence": "high"}', field)).toBe('SKIP');
+        });
+
+        test('should keep complete sentences of a long answer cut off by the token cap', () => {
+            const essay = { label: 'Why do you want to work here?', type: 'textarea' };
+            const truncated = '{"value": "I admire your mission. I have shipped \\"real\\" products! I also want to lea';
+            expect(parseFieldValueResponse(truncated, essay)).toBe('I admire your mission. I have shipped "real" products!');
+        });
+
+        test('should skip a truncated short answer', () => {
+            expect(parseFieldValueResponse('{"value": "Akash. Ra', field)).toBe('SKIP');
+        });
+
+        test('should skip invalid JSON', () => {
+            expect(parseFieldValueResponse('Based on the profile, the name is Akash', field)).toBe('SKIP');
+        });
+
+        test('should skip values outside the allowed options', () => {
+            const select = { label: 'Country', type: 'select', options: ['India', 'USA'] };
+            expect(parseFieldValueResponse('{"value": "Canada", "confidence": 0.8, "skip": false}', select)).toBe('SKIP');
+            expect(parseFieldValueResponse('{"value": "USA", "confidence": 0.8, "skip": false}', select)).toBe('USA');
+        });
+    });
+});
+
+describe('Service Worker - Job Posting Cache', () => {
+
+    beforeEach(() => {
+        mockStorage.data = {};
+    });
+
+    describe('canonicalPostingUrl()', () => {
+        test('should drop tracking params, hash and trailing slash', () => {
+            expect(canonicalPostingUrl('https://Jobs.Lever.co/acme/123/?utm_source=linkedin&lever-source=x#apply'))
+                .toBe('https://jobs.lever.co/acme/123');
+        });
+
+        test('should keep and sort meaningful params', () => {
+            expect(canonicalPostingUrl('https://example.com/jobs?b=2&gh_jid=9&a=1'))
+                .toBe('https://example.com/jobs?a=1&b=2&gh_jid=9');
+        });
+
+        test('should return invalid URLs unchanged', () => {
+            expect(canonicalPostingUrl('not a url')).toBe('not a url');
+        });
+    });
+
+    describe('hashText()', () => {
+        test('should ignore whitespace differences', async () => {
+            expect(await hashText('Senior  Engineer\n Remote')).toBe(await hashText('Senior Engineer Remote'));
+        });
+
+        test('should differ for different content', async () => {
+            expect(await hashText('Job A')).not.toBe(await hashText('Job B'));
+        });
+    });
+
+    describe('getJobCacheEntry() / updateJobCacheEntry()', () => {
+        const url = 'https://boards.greenhouse.io/acme/jobs/42?utm_campaign=x';
+        const jd = 'We are hiring a backend engineer with Node.js experience.';
+
+        test('should return cached analysis for the same posting and JD', async () => {
+            await updateJobCacheEntry(url, jd, { analysis: { score: 80 } });
+            const entry = await getJobCacheEntry('https://boards.greenhouse.io/acme/jobs/42', jd);
+            expect(entry.analysis).toEqual({ score: 80 });
+            expect(entry.jobDescription).toBe(jd);
+        });
+
+        test('should miss when the JD content changes', async () => {
+            await updateJobCacheEntry(url, jd, { analysis: { score: 80 } });
+            expect(await getJobCacheEntry(url, jd + ' Updated.')).toBeNull();
+        });
+
+        test('should look up the latest JD by URL alone', async () => {
+            await updateJobCacheEntry(url, jd, {});
+            const entry = await getJobCacheEntry(url);
+            expect(entry.jobDescription).toBe(jd);
+        });
+
+        test('should merge patches into one entry', async () => {
+            await updateJobCacheEntry(url, jd, { analysis: { score: 60 } });
+            await updateJobCacheEntry(url, jd, { coverLetter: 'Hi team' });
+            const entry = await getJobCacheEntry(url, jd);
+            expect(entry.analysis).toEqual({ score: 60 });
+            expect(entry.coverLetter).toBe('Hi team');
+        });
+
+        test('should evict least recently used entries', async () => {
+            const nowSpy = jest.spyOn(Date, 'now');
+            for (let i = 0; i <= JOB_CACHE_MAX_ENTRIES; i++) {
+                nowSpy.mockReturnValue(1000 + i);
+                await updateJobCacheEntry(`https://example.com/jobs/${i}`, `${jd} ${i}`, {});
+            }
+            nowSpy.mockRestore();
+
+            const cache = mockStorage.data[JOB_CACHE_KEY];
+            expect(Object.keys(cache)).toHaveLength(JOB_CACHE_MAX_ENTRIES);
+            expect(Object.values(cache).some(e => e.url === 'https://example.com/jobs/0')).toBe(false);
+        });
+
+        test('should not lose results saved while other lookups run', async () => {
+            await updateJobCacheEntry(url, jd, {});
+            await Promise.all([
+                getJobCacheEntry(url),
+                updateJobCacheEntry(url, jd, { analysis: { score: 75 } }),
+                getJobCacheEntry(url, jd),
+                updateJobCacheEntry('https://example.com/jobs/7', jd, { coverLetter: 'Hi team' })
+            ]);
+
+            expect((await getJobCacheEntry(url, jd)).analysis).toEqual({ score: 75 });
+            expect((await getJobCacheEntry('https://example.com/jobs/7', jd)).coverLetter).toBe('Hi team');
+        });
+
+        test('should drop expired entries and start fresh on update', async () => {
+            const nowSpy = jest.spyOn(Date, 'now');
+            nowSpy.mockReturnValue(1000);
+            await updateJobCacheEntry(url, jd, { analysis: { score: 80 } });
+
+            nowSpy.mockReturnValue(1000 + JOB_CACHE_TTL + 1);
+            expect(await getJobCacheEntry(url, jd)).toBeNull();
+            expect(Object.keys(mockStorage.data[JOB_CACHE_KEY])).toHaveLength(0);
+
+            await updateJobCacheEntry(url, jd, { coverLetter: 'Hi team' });
+            const entry = await getJobCacheEntry(url, jd);
+            nowSpy.mockRestore();
+
+            expect(entry.coverLetter).toBe('Hi team');
+            expect(entry.analysis).toBeUndefined();
+        });
+
+        test('should refresh an expired entry that is updated without a lookup', async () => {
+            const nowSpy = jest.spyOn(Date, 'now');
+            nowSpy.mockReturnValue(1000);
+            await updateJobCacheEntry(url, jd, {});
+
+            nowSpy.mockReturnValue(1000 + JOB_CACHE_TTL + 1);
+            await updateJobCacheEntry(url, jd, { analysis: { score: 70 } });
+            const entry = await getJobCacheEntry(url, jd);
+            nowSpy.mockRestore();
+
+            expect(entry.analysis).toEqual({ score: 70 });
+        });
+    });
+
+    describe('getCachedResult()', () => {
+        test('should hit only when the user context matches', async () => {
+            const jd = 'We are hiring a backend engineer with Node.js experience.';
+            const contextHash = await hashText('Resume v1');
+            await updateJobCacheEntry('https://example.com/jobs/1', jd, { analysis: { score: 80 }, analysisContext: contextHash });
+            const entry = await getJobCacheEntry('https://example.com/jobs/1', jd);
+
+            expect(getCachedResult(entry, 'analysis', contextHash)).toEqual({ score: 80 });
+            expect(getCachedResult(entry, 'analysis', await hashText('Resume v2'))).toBeNull();
+            expect(getCachedResult(entry, 'coverLetter', contextHash)).toBeNull();
+            expect(getCachedResult(null, 'analysis', contextHash)).toBeNull();
+        });
+    });
+});
+
 describe('Service Worker - Field Matching', () => {
     
     describe('findDirectMatch()', () => {